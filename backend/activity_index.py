@@ -0,0 +1,194 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+from firebase_admin import firestore
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.firebase_config import get_db
+from backend.query_cache import cached_query, invalidate
+
+# 📅 Per-user activity bitmap: one bit per day a journal or reflection was
+# written (saved stories don't count)
+#   activity/{user_id}              -> {"last_active", "current_streak", "longest_streak", "days_active"}
+#   activity/{user_id}/years/{YYYY} -> {"bits": 46 bytes, bit n = day-of-year n + 1}
+# The summary doc makes streak queries a single read; the yearly bitmaps
+# answer range and calendar questions without touching any entries.
+
+ACTIVITY = "activity"
+YEAR_BYTES = 46  # 366 bits
+
+
+def activity_tag(user_id):
+    return f"{ACTIVITY}/{user_id}"
+
+
+# 🧮 Bitmap helpers
+def _bit_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def set_bit(bits, index):
+    bits = bytearray(bits or bytes(YEAR_BYTES))
+    bits[index // 8] |= 1 << (index % 8)
+    return bytes(bits)
+
+
+def test_bit(bits, index):
+    return bool(bits) and bool(bits[index // 8] & (1 << (index % 8)))
+
+
+def count_bits(bits, first, last):
+    # popcount of bit indexes first..last inclusive
+    if not bits or last < first:
+        return 0
+    value = int.from_bytes(bits, "little") >> first
+    return (value & ((1 << (last - first + 1)) - 1)).bit_count()
+
+
+def _user_ref(user_id):
+    return get_db().collection(ACTIVITY).document(user_id)
+
+
+def _year_ref(user_id, year):
+    return _user_ref(user_id).collection("years").document(str(year))
+
+
+# ✍️ Two-phase update for use inside a transaction: read first, write after
+def read_for_update(transaction, user_id, day):
+    summary = _user_ref(user_id).get(transaction=transaction).to_dict() or {}
+    year_doc = _year_ref(user_id, day.year).get(transaction=transaction).to_dict() or {}
+    return {"user_id": user_id, "day": day, "summary": summary, "bits": year_doc.get("bits")}
+
+
+# Returns the current streak after the update
+def write_update(transaction, state):
+    user_id, day, summary, bits = state["user_id"], state["day"], state["summary"], state["bits"]
+    index = _bit_index(day)
+    if test_bit(bits, index):
+        return streak_from(summary, day)  # already active that day
+
+    transaction.set(_year_ref(user_id, day.year), {"bits": set_bit(bits, index)}, merge=True)
+
+    last_active = date.fromisoformat(summary["last_active"]) if summary.get("last_active") else None
+    current = summary.get("current_streak", 0)
+    if last_active is None or day > last_active + timedelta(days=1):
+        current = 1
+    elif day == last_active + timedelta(days=1):
+        current += 1
+    # (a day earlier than last_active only fills in the bitmap)
+
+    transaction.set(_user_ref(user_id), {
+        "last_active": max(day, last_active).isoformat() if last_active else day.isoformat(),
+        "current_streak": current,
+        "longest_streak": max(current, summary.get("longest_streak", 0)),
+        "days_active": firestore.Increment(1)
+    }, merge=True)
+    return current
+
+
+# 🔥 Stored current streak, or 0 if it lapsed before yesterday
+def streak_from(data, today):
+    last_active = date.fromisoformat(data["last_active"]) if data.get("last_active") else None
+    alive = last_active is not None and last_active >= today - timedelta(days=1)
+    return data.get("current_streak", 0) if alive else 0
+
+
+# 📖 O(1) summary reads
+@cached_query("activity_summary", tags=lambda user_id, *args: (activity_tag(user_id),))
+def summary(user_id, today):
+    data = _user_ref(user_id).get().to_dict() or {}
+    last_active = date.fromisoformat(data["last_active"]) if data.get("last_active") else None
+    return {
+        "current_streak": streak_from(data, today),
+        "longest_streak": data.get("longest_streak", 0),
+        "days_active": data.get("days_active", 0),
+        "last_active": last_active,
+    }
+
+
+def current_streak(user_id, today):
+    return summary(user_id, today)["current_streak"]
+
+
+def _year_bits(user_id, year):
+    return (_year_ref(user_id, year).get().to_dict() or {}).get("bits")
+
+
+# 📖 Days active between two dates (one read per calendar year covered)
+@cached_query("activity_range", tags=lambda user_id, *args: (activity_tag(user_id),))
+def days_active(user_id, start_day, end_day):
+    total = 0
+    for year in range(start_day.year, end_day.year + 1):
+        first = _bit_index(start_day) if year == start_day.year else 0
+        last = _bit_index(end_day) if year == end_day.year else 365
+        total += count_bits(_year_bits(user_id, year), first, last)
+    return total
+
+
+# 🗓️ [(date, active)] for every day of a year, for calendar heatmaps
+@cached_query("activity_calendar", tags=lambda user_id, *args: (activity_tag(user_id),))
+def calendar(user_id, year):
+    bits = _year_bits(user_id, year)
+    day, days = date(year, 1, 1), []
+    while day.year == year:
+        days.append((day, test_bit(bits, _bit_index(day))))
+        day += timedelta(days=1)
+    return days
+
+
+# 📜 Historical streaks as [(first_day, length)] for the given years
+def streak_history(user_id, years):
+    runs, start, length = [], None, 0
+    for year in sorted(years):
+        for day, active in calendar(user_id, year):
+            if active:
+                start, length = (start or day), length + 1
+            elif length:
+                runs.append((start, length))
+                start, length = None, 0
+    if length:
+        runs.append((start, length))
+    return runs
+
+
+# 🧱 One-off backfill from existing journals and reflections
+def rebuild_activity(user_id, legacy_user_id="demo_user"):
+    db = get_db()
+    active_days = set()
+    for collection in ("journals", "reflections"):
+        for doc in db.collection(collection).select(["created_at", "user_id", "source"]).stream():
+            data = doc.to_dict()
+            created_at = data.get("created_at")
+            if data.get("source") == "story":
+                continue
+            if created_at and data.get("user_id", legacy_user_id) == user_id:
+                active_days.add(created_at.date() if isinstance(created_at, datetime) else created_at)
+
+    years = {}
+    for day in active_days:
+        years[day.year] = set_bit(years.get(day.year), _bit_index(day))
+
+    batch = db.batch()
+    for year, bits in years.items():
+        batch.set(_year_ref(user_id, year), {"bits": bits})
+
+    longest, current, previous = 0, 0, None
+    for day in sorted(active_days):
+        current = current + 1 if previous and day == previous + timedelta(days=1) else 1
+        longest, previous = max(longest, current), day
+
+    batch.set(_user_ref(user_id), {
+        "last_active": previous.isoformat() if previous else None,
+        "current_streak": current,
+        "longest_streak": longest,
+        "days_active": len(active_days)
+    })
+    batch.commit()
+    invalidate(activity_tag(user_id))
+    return len(active_days)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "demo_user"
+    print(f"Indexed {rebuild_activity(target)} active days for {target}")
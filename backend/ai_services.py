@@ -1,71 +1,156 @@
-import os
-import uuid
-from dotenv import load_dotenv
-import google.generativeai as genai
-from backend.firebase_config import db
-from firebase_admin import firestore
-
-# 🌍 Load environment variables
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
-# 🔮 Gemini wrapper
-def generate_content(prompt, model_name="gemini-1.5-flash"):
+import json
+import random
+from backend.response_cache import response_cache
+from backend.resilience import call, gemini_breaker, classify, CircuitOpenError
+from backend.model_registry import get_model, DEFAULT_MODEL
+from backend.schemas import JournalAnalysis
+from pydantic import ValidationError
+
+# 🔮 Gemini wrapper (use_cache=False forces a fresh generation)
+def generate_content(prompt, model_name=DEFAULT_MODEL, use_cache=True):
+    if use_cache:
+        cached = response_cache.get(model_name, prompt)
+        if cached is not None:
+            return cached
+
     try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        response = call(get_model(model_name).generate_content, prompt)
+        text = response.text.strip()
+        if use_cache:
+            response_cache.put(model_name, prompt, text)
+        return text
+    except CircuitOpenError:
+        return None  # fail fast while Gemini is down
     except Exception as e:
-        print(f"Gemini error: {e}")
+        print(f"Gemini error ({classify(e)}): {e}")
         return None  # Return None so caller can handle fallback
 
-# 🧠 Mood analysis from journal entry
-def analyze_mood(text):
+# 🌊 Streaming Gemini wrapper: yields text chunks as they arrive.
+# Yields nothing on failure so callers can supply their own fallback.
+def generate_content_stream(prompt, model_name=DEFAULT_MODEL, use_cache=True):
+    if use_cache:
+        cached = response_cache.get(model_name, prompt)
+        if cached is not None:
+            yield cached
+            return
+
+    # Retries cover opening the stream, and call() records its outcome
+    try:
+        stream = call(get_model(model_name).generate_content, prompt, stream=True)
+    except CircuitOpenError:
+        return
+    except Exception as e:
+        print(f"Gemini stream error ({classify(e)}): {e}")
+        return
+
+    # A failure mid-stream happens after call() returned, so record it here
+    parts = []
+    try:
+        for chunk in stream:
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield text
+    except Exception as e:
+        gemini_breaker.record_failure(classify(e))
+        print(f"Gemini stream error ({classify(e)}): {e}")
+        return
+
+    full_text = "".join(parts).strip()
+    if use_cache and full_text:
+        response_cache.put(model_name, prompt, full_text)
+
+# 🚦 False while the Gemini circuit is open (calls would fail fast anyway)
+def gemini_available():
+    return gemini_breaker.state != "open"
+
+def stream_with_fallback(chunks, fallback):
+    produced = False
+    for chunk in chunks:
+        produced = True
+        yield chunk
+    if not produced and fallback:
+        yield fallback
+
+# 🧾 Pull the JSON object out of a model reply and validate it against a schema
+def parse_structured(output, schema):
+    if not output:
+        return None
+    start, end = output.find("{"), output.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        return schema.model_validate_json(output[start:end + 1])
+    except ValidationError as e:
+        print(f"Gemini schema error: {e}")
+        return None
+
+
+def _json_instructions(schema):
+    return (
+        "Respond with a single JSON object only (no markdown, no commentary) "
+        f"that matches this JSON schema:\n{json.dumps(schema.model_json_schema())}"
+    )
+
+
+# 🧩 Combined analysis: mood, feedback, affirmation, goal and story in one round trip
+def analyze_journal(text, persona_name, recipes_by_mood):
     if len(text.strip()) < 10:
-        return "unclear", "Please write a bit more so I can understand your mood better."
+        comfort_food = recipes_by_mood.get("unclear", ["Chai"])[0]
+        return JournalAnalysis(
+            mood="unclear",
+            feedback="Please write a bit more so I can understand your mood better.",
+            affirmation="You're doing great.",
+            weekly_goal="Stay consistent and reflect daily.",
+            comfort_food=comfort_food,
+            comfort_story=f"Someone unsure of their feelings found comfort in making {comfort_food}—a simple joy that lifted their spirits."
+        )
 
-    prompt = f"""Analyze this journal entry and respond with:
-Mood: <label only, no numbering>
-Feedback: <one helpful sentence only, no numbering or prefix>
+    prompt = f"""You are {persona_name}, a warm journaling companion. For the journal entry below:
+- detect the writer's mood (one lowercase word, preferably one of: {", ".join(recipes_by_mood)})
+- give one helpful sentence of feedback
+- write a personalized one-sentence affirmation and one weekly goal for them
+- pick a comfort food for that mood from these suggestions: {json.dumps(recipes_by_mood)}
+- write a short, cozy story about someone feeling that mood making the comfort food to feel better; make it warm, personal, and emotionally uplifting
+{_json_instructions(JournalAnalysis)}
 
 Entry:
 {text}
 """
+    return parse_structured(generate_content(prompt), JournalAnalysis)
 
-    try:
-        output = generate_content(prompt)
-        mood = "unknown"
-        feedback = "no feedback provided."
-
-        if output:
-            for line in output.split("\n"):
-                if "mood:" in line.lower():
-                    mood = line.split(":", 1)[1].strip().lower()
-                elif "feedback:" in line.lower():
-                    feedback = line.split(":", 1)[1].strip()
-                    feedback = feedback.lstrip("1234567890.:- ").strip()
-
-        # Save to Firestore
-        entry_id = str(uuid.uuid4())
-        db.collection("journals").document(entry_id).set({
-            "id": entry_id,
-            "entry": text,
-            "mood": mood,
-            "feedback": feedback,
-            "created_at": firestore.SERVER_TIMESTAMP
-        })
-
-        return mood, feedback
-
-    except Exception as e:
-        print(f"Error during mood analysis: {e}")
-        return "error", "Could not analyze mood due to an internal issue."
+# 🧯 Canned texts served while Gemini is unavailable
+CANNED_AFFIRMATIONS = {
+    "happy": ["Your joy is worth savoring—let it spill into everything you do today.",
+              "You earned this lightness. Enjoy it fully."],
+    "sad": ["It's okay to feel this; gentle steps still move you forward.",
+            "You are allowed to rest—sadness is not weakness."],
+    "anxious": ["Breathe in slowly: you have handled hard moments before and you will again.",
+                "You don't have to solve everything right now—just the next small step."],
+    "angry": ["Your feelings are valid; you can choose calm in how you respond.",
+              "Let the heat pass through you—you are in control of your next move."],
+    "calm": ["This steady peace is yours—carry it with you.",
+             "Stillness is strength. You are grounded."],
+    "excited": ["Channel this spark—great things are unfolding for you.",
+                "Your enthusiasm is a gift; let it lead you."],
+    "reflective": ["Looking inward is how you grow—trust what you discover.",
+                   "Your thoughts are worth listening to."],
+    "default": ["You're doing your best—keep going."],
+}
 
 # 🎯 Affirmation generator for booster page
-def generate_affirmation(mood):
-    prompt = f"Give a one-sentence affirmation for someone feeling {mood}."
-    response = generate_content(prompt)
-    return response or "You're doing your best—keep going."
+def affirmation_prompt(mood):
+    return f"Give a one-sentence affirmation for someone feeling {mood}."
+
+def _affirmation_fallback(mood):
+    return random.choice(CANNED_AFFIRMATIONS.get(str(mood).lower(), CANNED_AFFIRMATIONS["default"]))
+
+def stream_affirmation(mood):
+    return stream_with_fallback(generate_content_stream(affirmation_prompt(mood)), _affirmation_fallback(mood))
+
+# 🎭 Emotion story prompt for the weekly summary (live jobs and the content pool)
+def emotion_story_prompt(mood):
+    return f"Write a 5-line emotional story that captures the feeling of being {mood}."
 
 # 🌟 Affirmation + Goal generator for journal page
 def generate_affirmation_and_goal(entry, persona_name):
@@ -78,10 +163,17 @@ def generate_affirmation_and_goal(entry, persona_name):
     return response or "Affirmation: You're doing great.\nWeekly Goal: Stay consistent and reflect daily."
 
 # 📖 Comfort Food Story generator for RecipeRadar
-def generate_comfort_story(recipe_name, mood):
-    prompt = (
+def _comfort_story_prompt(recipe_name, mood):
+    return (
         f"Write a short, cozy story about someone feeling {mood} and making {recipe_name} to feel better. "
         f"Make it warm, personal, and emotionally uplifting."
     )
-    response = generate_content(prompt)
-    return response or f"Someone feeling {mood} found comfort in making {recipe_name}—a simple joy that lifted their spirits."
+
+def _comfort_story_fallback(recipe_name, mood):
+    return f"Someone feeling {mood} found comfort in making {recipe_name}—a simple joy that lifted their spirits."
+
+def stream_comfort_story(recipe_name, mood):
+    return stream_with_fallback(
+        generate_content_stream(_comfort_story_prompt(recipe_name, mood)),
+        _comfort_story_fallback(recipe_name, mood)
+    )
@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.local_store import data_path
+from backend.executor import deadline, record_background_call
+from backend.resilience import gemini_breaker
+
+# 🫙 Ready-made Gemini texts per (kind, mood), persisted in SQLite.
+# take() serves the oldest unused text instantly; when a pool falls below
+# LOW_WATER a background refill tops it up to TARGET_SIZE with fresh,
+# uncached generations. warm() fills every pool at server start.
+# Each generation runs under GENERATION_TIMEOUT_SECONDS, handed to the SDK
+# call like any AI-pool task; a refill that stops making progress is treated
+# as stale, so a hung call can never block its pool for good.
+# Refills share Gemini quota and the circuit breaker with user requests, so
+# all of them together make at most REFILL_CALLS_PER_MINUTE calls, and only
+# while the breaker is closed; a startup warm() trickles in, never bursts.
+
+TARGET_SIZE = 6
+LOW_WATER = 2
+REFILL_WORKERS = 2  # own small pool, so warming never crowds out user requests on the AI pool
+MOODS = ("happy", "sad", "anxious", "calm", "excited", "reflective")
+GENERATION_TIMEOUT_SECONDS = 30
+STALE_REFILL_SECONDS = 2 * GENERATION_TIMEOUT_SECONDS  # no progress for this long -> refill again
+REFILL_CALLS_PER_MINUTE = 4
+
+_rate_lock = threading.Lock()
+_next_call_at = 0.0
+
+_refiller = ThreadPoolExecutor(max_workers=REFILL_WORKERS, thread_name_prefix="echosoul-content-pool")
+
+# A random angle per generation keeps pooled texts from repeating each other
+ANGLES = (
+    "focus on a small everyday moment", "speak to them like a close friend",
+    "use a gentle nature image", "keep it bold and energizing",
+    "look toward tomorrow", "notice something in the body or breath",
+)
+
+
+# kind -> prompt builder in backend.ai_services, resolved on first refill
+PROMPTS = {
+    "affirmation": "affirmation_prompt",
+    "story": "emotion_story_prompt",
+}
+
+
+# ⏱️ Reserve the next refill call slot and sleep until it comes up
+def _wait_for_slot():
+    global _next_call_at
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(now, _next_call_at)
+        _next_call_at = slot + 60 / REFILL_CALLS_PER_MINUTE
+    time.sleep(slot - now)
+
+
+class ContentPool:
+    def __init__(self, path=None):
+        self.path = path or data_path("content_pool.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+        self._refilling = {}  # (kind, mood) -> (token, last progress)
+        self._stats = {"served": 0, "empty": 0, "generated": 0, "refills": 0}
+
+    # 🗄️ Storage
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pooled_texts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    mood TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pooled_by_mood ON pooled_texts (kind, mood, id)")
+            self._conn.commit()
+        return self._conn
+
+    def size(self, kind, mood):
+        with self._lock:
+            return self._db().execute(
+                "SELECT COUNT(*) FROM pooled_texts WHERE kind = ? AND mood = ?", (kind, mood.lower())
+            ).fetchone()[0]
+
+    # ⚡ Oldest pooled text (or None), then a refill if the pool is running low
+    def take(self, kind, mood):
+        mood = mood.lower()
+        with self._lock:
+            conn = self._db()
+            row = conn.execute(
+                "SELECT id, text FROM pooled_texts WHERE kind = ? AND mood = ? ORDER BY id LIMIT 1", (kind, mood)
+            ).fetchone()
+            if row:
+                conn.execute("DELETE FROM pooled_texts WHERE id = ?", (row[0],))
+                conn.commit()
+                self._stats["served"] += 1
+            else:
+                self._stats["empty"] += 1
+        if self.size(kind, mood) < LOW_WATER:
+            self.refill(kind, mood)
+        return row[1] if row else None
+
+    def _add(self, kind, mood, text):
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO pooled_texts (kind, mood, text, created_at) VALUES (?, ?, ?, ?)",
+                (kind, mood, text, time.time())
+            )
+            self._db().commit()
+            self._stats["generated"] += 1
+
+    def _fill(self, kind, mood, token):
+        from backend import ai_services
+
+        prompt_for = getattr(ai_services, PROMPTS[kind])
+        owns = lambda: self._refilling.get((kind, mood), (None,))[0] == token
+        try:
+            while self.size(kind, mood) < TARGET_SIZE and owns():
+                _wait_for_slot()
+                if gemini_breaker.state != "closed":
+                    break  # never probe or hammer a struggling Gemini from the background
+                with self._lock:
+                    if not owns():
+                        return  # declared stale; a newer refill owns this pool
+                    self._refilling[(kind, mood)] = (token, time.monotonic())
+                prompt = f"{prompt_for(mood)} For variety, {random.choice(ANGLES)}."
+                record_background_call()
+                with deadline(GENERATION_TIMEOUT_SECONDS):
+                    text = ai_services.generate_content(prompt, use_cache=False)
+                if not text:
+                    break  # Gemini unavailable: try again on the next take()
+                self._add(kind, mood, text)
+        finally:
+            with self._lock:
+                if owns():
+                    del self._refilling[(kind, mood)]
+
+    # 🔄 Asynchronous top-up; one live refill per pool at a time
+    def refill(self, kind, mood):
+        mood = mood.lower()
+        token = object()
+        with self._lock:
+            running = self._refilling.get((kind, mood))
+            if running and time.monotonic() - running[1] < STALE_REFILL_SECONDS:
+                return False
+            self._refilling[(kind, mood)] = (token, time.monotonic())
+            self._stats["refills"] += 1
+        _refiller.submit(self._fill, kind, mood, token)
+        return True
+
+    def warm(self, kinds=tuple(PROMPTS), moods=MOODS):
+        for kind in kinds:
+            for mood in moods:
+                if self.size(kind, mood) < TARGET_SIZE:
+                    self.refill(kind, mood)
+
+    def stats(self):
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT kind, mood, COUNT(*) FROM pooled_texts GROUP BY kind, mood"
+            ).fetchall()
+            return {**self._stats, "refilling": len(self._refilling),
+                    "pools": {f"{kind}/{mood}": count for kind, mood, count in rows}}
+
+
+content_pool = ContentPool()
+
+
+if __name__ == "__main__":
+    content_pool.warm()
+    print(f"🫙 Warming pools: {content_pool.stats()}")
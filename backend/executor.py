@@ -0,0 +1,92 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# 🧵 One bounded pool for outbound AI calls, shared by every Streamlit session.
+# At most MAX_WORKERS calls run and MAX_QUEUED wait; beyond that submit()
+# raises PoolSaturated instead of letting the backlog grow without bound.
+# A task submitted with a timeout carries its deadline in a contextvar;
+# resilience.call() caps each SDK attempt's timeout by the time remaining().
+# Nothing ever waits on an abandoned task: it finishes in the background.
+
+MAX_WORKERS = 8
+MAX_QUEUED = 32
+
+AI_POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="echosoul-ai")
+
+_deadline = contextvars.ContextVar("echosoul_deadline", default=None)
+_lock = threading.Lock()
+_in_flight = 0
+_stats = {"submitted": 0, "rejected": 0, "completed": 0, "expired": 0, "peak_in_flight": 0,
+          "background_calls": 0}
+
+
+class PoolSaturated(RuntimeError):
+    pass
+
+
+# ⏳ Seconds left before the current task's deadline (None = no deadline)
+def remaining():
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+# ⏲️ Give work outside the AI pool (e.g. the content pool refiller) a deadline
+@contextmanager
+def deadline(seconds):
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _release():
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+        _stats["completed"] += 1
+
+
+def _run(deadline, fn, args, kwargs):
+    token = _deadline.set(deadline)
+    try:
+        if deadline is not None and time.monotonic() >= deadline:
+            with _lock:
+                _stats["expired"] += 1
+            raise TimeoutError("Deadline passed while the task was queued")
+        return fn(*args, **kwargs)
+    finally:
+        _deadline.reset(token)
+        _release()
+
+
+def submit(fn, *args, timeout=None, **kwargs):
+    global _in_flight
+    with _lock:
+        if _in_flight >= MAX_WORKERS + MAX_QUEUED:
+            _stats["rejected"] += 1
+            raise PoolSaturated("AI pool is saturated; try again shortly")
+        _in_flight += 1
+        _stats["submitted"] += 1
+        _stats["peak_in_flight"] = max(_stats["peak_in_flight"], _in_flight)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    try:
+        return AI_POOL.submit(_run, deadline, fn, args, kwargs)
+    except Exception:
+        _release()
+        raise
+
+
+# 📊 AI calls made outside this pool (content pool refills) still spend
+# quota; count them here so stats() shows the whole outbound load
+def record_background_call():
+    with _lock:
+        _stats["background_calls"] += 1
+
+
+def stats():
+    with _lock:
+        return {**_stats, "in_flight": _in_flight, "max_workers": MAX_WORKERS, "max_queued": MAX_QUEUED}
@@ -1,23 +1,118 @@
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore
+import time
+import threading
 
-project_id = os.getenv("FIREBASE_PROJECT_ID")
-client_email = os.getenv("FIREBASE_CLIENT_EMAIL")
-private_key_raw = os.getenv("FIREBASE_PRIVATE_KEY")
+# 🔥 Lazily created Firestore client. Importing this module is free: the
+# Firebase SDK is imported, credentials are built and the client is created
+# on the first get_db() call.
+# Set FIRESTORE_EMULATOR_HOST (e.g. "localhost:8080") to run against the
+# local emulator; no secrets are needed in that mode.
 
-if not all([project_id, client_email, private_key_raw]):
-    raise ValueError("Missing Firebase secrets. Check Streamlit Cloud settings.")
+HEALTH_COLLECTION = "_health"
+DEFAULT_EMULATOR_PROJECT = "echosoul-local"
+RECHECK_SECONDS = 60  # while unavailable, re-probe at most this often
 
-private_key = private_key_raw.replace("\\n", "\n")
+_lock = threading.Lock()
+_db = None
+_status = {"ready": None, "detail": "warming up", "checked_at": 0.0, "checking": False}
 
-cred = credentials.Certificate({
-    "type": "service_account",
-    "project_id": project_id,
-    "private_key": private_key,
-    "client_email": client_email,
-    "token_uri": "https://oauth2.googleapis.com/token"
-})
 
-firebase_admin.initialize_app(cred)
-db = firestore.client()
+# Not a ValueError: fixing the secrets makes queued writes succeed again,
+# so the write queue must keep retrying rather than dead-letter them
+class FirebaseConfigError(RuntimeError):
+    pass
+
+
+def emulator_host():
+    return os.getenv("FIRESTORE_EMULATOR_HOST")
+
+
+def _certificate():
+    from firebase_admin import credentials
+
+    project_id = os.getenv("FIREBASE_PROJECT_ID")
+    client_email = os.getenv("FIREBASE_CLIENT_EMAIL")
+    private_key_raw = os.getenv("FIREBASE_PRIVATE_KEY")
+
+    if not all([project_id, client_email, private_key_raw]):
+        raise FirebaseConfigError("Missing Firebase secrets. Check Streamlit Cloud settings.")
+
+    return credentials.Certificate({
+        "type": "service_account",
+        "project_id": project_id,
+        "private_key": private_key_raw.replace("\\n", "\n"),
+        "client_email": client_email,
+        "token_uri": "https://oauth2.googleapis.com/token"
+    })
+
+
+def _create_client():
+    if emulator_host():
+        # The client library routes to the emulator on its own when the env var is set
+        from google.auth.credentials import AnonymousCredentials
+        from google.cloud import firestore as cloud_firestore
+
+        project_id = os.getenv("FIREBASE_PROJECT_ID", DEFAULT_EMULATOR_PROJECT)
+        print(f"🧪 Using Firestore emulator at {emulator_host()} (project {project_id})")
+        return cloud_firestore.Client(project=project_id, credentials=AnonymousCredentials())
+
+    import firebase_admin
+    from firebase_admin import firestore
+
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(_certificate())
+    return firestore.client()
+
+
+def get_db():
+    global _db
+    if _db is None:
+        with _lock:
+            if _db is None:
+                _db = _create_client()
+    return _db
+
+
+# ✅ Readiness probe: (ready, detail) without raising. Blocks up to timeout;
+# the UI reads readiness() instead.
+def check_ready(timeout=5):
+    try:
+        started = time.perf_counter()
+        get_db().collection(HEALTH_COLLECTION).document("ping").get(timeout=timeout)
+        target = f"emulator {emulator_host()}" if emulator_host() else "firestore"
+        ready, detail = True, f"{target} ok in {(time.perf_counter() - started) * 1000:.0f} ms"
+    except Exception as e:
+        ready, detail = False, str(e)
+    with _lock:
+        _status.update(ready=ready, detail=detail, checked_at=time.monotonic(), checking=False)
+    return ready, detail
+
+
+# 🔌 Open the gRPC channel ahead of the first real query; its probe result
+# becomes the readiness status
+def warm_up():
+    ready, detail = check_ready(timeout=10)
+    print(f"🔥 Firestore warm: {detail}" if ready else f"Firestore warm-up error: {detail}")
+    return ready
+
+
+# 🚦 Last known (ready, detail), never blocking. ready is None until the
+# warm-up probe finishes. A healthy client is not re-probed; after a failure
+# a background re-check runs at most every RECHECK_SECONDS.
+def readiness():
+    with _lock:
+        stale = _status["ready"] is False and not _status["checking"] \
+            and time.monotonic() - _status["checked_at"] > RECHECK_SECONDS
+        if stale:
+            _status["checking"] = True
+        ready, detail = _status["ready"], _status["detail"]
+    if stale:
+        threading.Thread(target=check_ready, name="echosoul-firestore-recheck", daemon=True).start()
+    return ready, detail
+
+
+def __getattr__(name):
+    # Keeps `from backend.firebase_config import db` working, created on first access
+    if name == "db":
+        return get_db()
+    raise AttributeError(name)
@@ -0,0 +1,118 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+from backend.executor import submit, PoolSaturated
+
+# 🧰 Background generation jobs, shared by every Streamlit session.
+# A page submits a job, keeps only its ID in st.session_state and polls;
+# the work runs on the AI pool, so reruns, widget clicks and page switches
+# never cancel it. Jobs whose function returns an iterator stream: chunks
+# are appended as they arrive and can be shown while the job is running.
+# Submitting the same key again reuses the running or finished job, unless
+# it failed or sat in the queue past its deadline.
+
+MAX_JOBS = 256
+JOB_TIMEOUT_SECONDS = 60  # deadline handed to the SDK calls inside a job
+RESULT_TTL_SECONDS = 3600
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_lock = threading.Lock()
+_jobs = OrderedDict()  # job_id -> job dict
+_keys = {}             # key -> job_id
+
+
+def _new_job(key):
+    return {"id": uuid.uuid4().hex, "key": key, "status": QUEUED, "parts": [], "result": None,
+            "error": None, "created_at": time.time(), "finished_at": None,
+            "deadline": time.time() + JOB_TIMEOUT_SECONDS}
+
+
+def _run(job, fn, args, kwargs):
+    job["status"] = RUNNING
+    try:
+        result = fn(*args, **kwargs)
+        if result is not None and not isinstance(result, str) and hasattr(result, "__iter__"):
+            for chunk in result:
+                job["parts"].append(chunk)  # list.append is atomic; readers join a copy
+            result = "".join(job["parts"])
+        job["result"] = result
+        job["status"] = DONE
+    except Exception as e:
+        print(f"Job {job['id']} error: {e}")
+        job["error"] = str(e)
+        job["status"] = FAILED
+    finally:
+        job["finished_at"] = time.time()
+
+
+# ☠️ The executor drops a task whose deadline passed in the queue before _run
+# ever starts; close such jobs here so pollers and keyed reuse see FAILED
+def _finalize(job, future):
+    if job["finished_at"] is not None:
+        return
+    error = None if future.cancelled() else future.exception()
+    job.update(status=FAILED, error=str(error or "Job was cancelled"), finished_at=time.time())
+
+
+def _stale(job, now):
+    return job["status"] == QUEUED and now > job["deadline"]
+
+
+def _expired(job, now):
+    return job["finished_at"] is not None and now - job["finished_at"] > RESULT_TTL_SECONDS
+
+
+def _evict(now):
+    for job_id, job in list(_jobs.items()):
+        if len(_jobs) <= MAX_JOBS and not _expired(job, now):
+            break
+        if job["finished_at"] is None:
+            continue  # never drop a job that is still running
+        del _jobs[job_id]
+        if _keys.get(job["key"]) == job_id:
+            del _keys[job["key"]]
+
+
+def submit_job(fn, *args, key=None, **kwargs):
+    now = time.time()
+    with _lock:
+        existing = _jobs.get(_keys.get(key)) if key is not None else None
+        if existing and existing["status"] != FAILED and not _expired(existing, now) \
+                and not _stale(existing, now):
+            return existing["id"]
+
+        job = _new_job(key)
+        _jobs[job["id"]] = job
+        if key is not None:
+            _keys[key] = job["id"]
+        _evict(now)
+    try:
+        future = submit(_run, job, fn, args, kwargs, timeout=JOB_TIMEOUT_SECONDS)
+    except PoolSaturated as e:
+        # Backpressure: fail the job at once rather than queue without bound
+        job.update(status=FAILED, error=str(e), finished_at=time.time())
+    else:
+        future.add_done_callback(lambda f: _finalize(job, f))
+    return job["id"]
+
+
+# 📖 Snapshot of a job: {"id", "status", "text", "result", "error", "done"}; None if unknown
+def get_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    text = job["result"] if job["status"] == DONE and isinstance(job["result"], str) else "".join(list(job["parts"]))
+    return {"id": job["id"], "status": job["status"], "text": text, "result": job["result"],
+            "error": job["error"], "done": job["status"] in (DONE, FAILED)}
+
+
+def stats():
+    with _lock:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in _jobs.values():
+            counts[job["status"]] += 1
+        return {**counts, "jobs": len(_jobs)}
@@ -0,0 +1,273 @@
+import hashlib
+from datetime import datetime, time, timedelta
+from firebase_admin import firestore
+from backend.firebase_config import get_db
+from backend.search_index import add_to_index, remove_from_index, index_overflow, search_tag
+from backend.rollups import record_journal, record_reflection, journal_removal, rollup_tag
+from backend.query_cache import cached_query, invalidate
+from backend import activity_index
+from backend.write_queue import write_queue
+
+# 🗂️ Single owner of every journal / reflection write.
+# Document IDs are content hashes, so a double-clicked submit rewrites the
+# same document instead of creating a second one.
+
+JOURNALS = "journals"
+REFLECTIONS = "reflections"
+LEGACY_USER_ID = "demo_user"  # owner of entries written before user_id was stored
+PREVIEW_CHARS = 140
+PREVIEW_FIELDS = ["mood", "preview", "created_at"]  # all a History list row needs
+
+
+# 🏷️ Cache tags: one user's pages, and one entry's full document
+def journals_tag(user_id):
+    return f"{JOURNALS}/{user_id}"
+
+
+def entry_tag(entry_id):
+    return f"journal_entry/{entry_id}"
+
+
+def idempotency_key(user_id, kind, text, day):
+    raw = f"{user_id}\x00{kind}\x00{day.isoformat()}\x00{text.strip()}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def preview_text(text, limit=PREVIEW_CHARS):
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+# 🧾 Canonical document shapes
+def journal_document(entry_id, user_id, text, mood, feedback, engine, source, created_at):
+    return {
+        "id": entry_id,
+        "user_id": user_id,
+        "entry": text,
+        "preview": preview_text(text),
+        "mood": (mood or "unknown").lower(),
+        "feedback": feedback or "",
+        "engine": engine,
+        "source": source,
+        "created_at": created_at,
+        "written_at": firestore.SERVER_TIMESTAMP  # commit time; queued writes keep their original created_at
+    }
+
+
+def reflection_document(reflection_id, user_id, text, mood, rating, created_at):
+    return {
+        "id": reflection_id,
+        "user_id": user_id,
+        "text": text,
+        "mood": (mood or "unknown").lower(),
+        "rating": rating,
+        "created_at": created_at,
+        "written_at": firestore.SERVER_TIMESTAMP
+    }
+
+
+# 🔒 Entry, activity bitmap (the one source of streaks) and derived data
+# (search postings, rollups) commit together or not at all. extra_writes are
+# callables taking the transaction; they run after all reads. Entries saved
+# with count_streak=False (stories) leave the activity bitmap alone.
+# Returns the streak after the write, or None when it does not count.
+@firestore.transactional
+def _commit_entry(transaction, entry_ref, document, today, count_streak, extra_writes=()):
+    existing = entry_ref.get(transaction=transaction)
+    activity = activity_index.read_for_update(transaction, document["user_id"], today) if count_streak else None
+
+    if existing.exists:
+        # duplicate submit: nothing new to write
+        return activity_index.streak_from(activity["summary"], today) if activity else None
+
+    transaction.set(entry_ref, document)
+    for write in extra_writes:
+        write(transaction)
+    return activity_index.write_update(transaction, activity) if activity else None
+
+
+def _save(collection, document, count_streak, now, extra_writes=()):
+    db = get_db()
+    entry_ref = db.collection(collection).document(document["id"])
+    return _commit_entry(db.transaction(), entry_ref, document, now.date(), count_streak, extra_writes)
+
+
+def _created_at(created_at):
+    # Queued writes carry their original timestamp as an ISO string
+    if isinstance(created_at, str):
+        return datetime.fromisoformat(created_at)
+    return created_at or datetime.now()
+
+
+# ✍️ Returns (entry_id, streak)
+def save_journal_entry(user_id, text, mood, feedback, engine, source="journal", count_streak=True, created_at=None):
+    now = _created_at(created_at)
+    entry_id = idempotency_key(user_id, source, text, now.date())
+    document = journal_document(entry_id, user_id, text, mood, feedback, engine, source, now)
+    extra_writes = (
+        lambda writer: add_to_index(writer, user_id, entry_id, text),
+        lambda writer: record_journal(writer, user_id, document["mood"], now),
+    )
+    streak = _save(JOURNALS, document, count_streak, now, extra_writes)
+    index_overflow(user_id, entry_id, text)
+    invalidate(journals_tag(user_id), search_tag(user_id), rollup_tag(user_id), activity_index.activity_tag(user_id))
+    return entry_id, streak
+
+
+def save_story(user_id, mood, story_text):
+    entry_id, _ = save_journal_entry(user_id, story_text, mood, "", None, source="story", count_streak=False)
+    return entry_id
+
+
+def save_reflection(user_id, text, mood, rating, created_at=None):
+    now = _created_at(created_at)
+    reflection_id = idempotency_key(user_id, "reflection", text, now.date())
+    document = reflection_document(reflection_id, user_id, text, mood, rating, now)
+    extra_writes = (lambda writer: record_reflection(writer, user_id, document["mood"], rating, now),)
+    _save(REFLECTIONS, document, True, now, extra_writes)  # reflections keep a streak alive too
+    invalidate(REFLECTIONS, rollup_tag(user_id), activity_index.activity_tag(user_id))
+    return reflection_id
+
+
+# 📮 Write-behind variants: persist locally, return at once, flush in order.
+# IDs are computed here so the caller gets the same ID the flush will write.
+def projected_streak(user_id, today):
+    try:
+        activity = activity_index.summary(user_id, today)
+    except Exception as e:
+        print(f"Streak lookup error: {e}")
+        return None
+    last_active = activity["last_active"]
+    if last_active == today:
+        return activity["current_streak"]
+    if last_active == today - timedelta(days=1):
+        return activity["current_streak"] + 1
+    return 1
+
+
+def queue_journal_entry(user_id, text, mood, feedback, engine, source="journal", count_streak=True):
+    now = datetime.now()
+    write_queue.enqueue("journal", {
+        "user_id": user_id, "text": text, "mood": mood, "feedback": feedback, "engine": engine,
+        "source": source, "count_streak": count_streak, "created_at": now.isoformat()
+    })
+    streak = projected_streak(user_id, now.date()) if count_streak else None
+    return idempotency_key(user_id, source, text, now.date()), streak
+
+
+def queue_story(user_id, mood, story_text):
+    entry_id, _ = queue_journal_entry(user_id, story_text, mood, "", None, source="story", count_streak=False)
+    return entry_id
+
+
+def queue_reflection(user_id, text, mood, rating):
+    now = datetime.now()
+    write_queue.enqueue("reflection", {
+        "user_id": user_id, "text": text, "mood": mood, "rating": rating, "created_at": now.isoformat()
+    })
+    return idempotency_key(user_id, "reflection", text, now.date())
+
+
+# 🗑️ Entry, its postings and its rollup counts go in one transaction, with
+# the rollup shards read inside it so the decrement never goes below zero
+@firestore.transactional
+def _delete_entry(transaction, entry_ref):
+    data = entry_ref.get(transaction=transaction).to_dict()
+    if data is None:
+        return None
+
+    owner = data.get("user_id", LEGACY_USER_ID)
+    uncount = journal_removal(transaction, owner, data.get("mood"), data["created_at"]) if data.get("created_at") else None
+    transaction.delete(entry_ref)
+    if data.get("entry"):
+        remove_from_index(transaction, owner, entry_ref.id, data["entry"])
+    if uncount:
+        uncount(transaction)
+    return data
+
+
+def delete_journal_entry(entry_id):
+    db = get_db()
+    data = _delete_entry(db.transaction(), db.collection(JOURNALS).document(entry_id))
+    if data is None:
+        return
+
+    owner = data.get("user_id", LEGACY_USER_ID)
+    if data.get("entry"):
+        index_overflow(owner, entry_id, data["entry"], remove=True)
+    invalidate(journals_tag(owner), search_tag(owner), entry_tag(entry_id), rollup_tag(owner))
+
+
+# 🏷️ Relabel an entry's mood on a batch or transaction, moving its rollup
+# counts from the old mood to the new one. Returns the entry's owner.
+MOOD_UPDATE_WRITES = 5  # entry + day/week shards for the old and the new mood
+
+
+def update_journal_mood(writer, entry_id, data, mood, fields=None, collection=JOURNALS):
+    owner = data.get("user_id", LEGACY_USER_ID)
+    old_mood, mood = (data.get("mood") or "unknown").lower(), (mood or "unknown").lower()
+    writer.update(get_db().collection(collection).document(entry_id), {"mood": mood, **(fields or {})})
+    if collection == JOURNALS and data.get("created_at") and old_mood != mood:
+        record_journal(writer, owner, old_mood, data["created_at"], sign=-1)
+        record_journal(writer, owner, mood, data["created_at"])
+    return owner
+
+
+# 📄 One page of a user's journals, newest first. Filters run server-side and
+# are backed by the composite indexes in firestore.indexes.json. Only
+# PREVIEW_FIELDS are read; fetch_journal_entry loads the full document.
+# Returns (snapshots, has_next); pass the last snapshot back as cursor.
+@cached_query("journal_page", tags=lambda user_id, *args, **kwargs: (journals_tag(user_id),))
+def fetch_journal_page(user_id, mood=None, start_date=None, end_date=None, cursor=None, page_size=10):
+    query = get_db().collection(JOURNALS).select(PREVIEW_FIELDS).where("user_id", "==", user_id)
+    if mood:
+        query = query.where("mood", "==", mood.lower())
+    if start_date:
+        query = query.where("created_at", ">=", datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.where("created_at", "<", datetime.combine(end_date + timedelta(days=1), time.min))
+    query = query.order_by("created_at", direction=firestore.Query.DESCENDING)
+    if cursor is not None:
+        query = query.start_after(cursor)
+
+    docs = list(query.limit(page_size + 1).stream())
+    return docs[:page_size], len(docs) > page_size
+
+
+
+# 📖 Full entry (text + feedback), read only when a History row is opened
+@cached_query("journal_entry", tags=lambda entry_id: (entry_tag(entry_id),))
+def fetch_journal_entry(entry_id):
+    return get_db().collection(JOURNALS).document(entry_id).get().to_dict()
+
+
+# 🧱 One-off backfill of the preview and user_id fields for entries written
+# before they existed (History pages filter on user_id)
+def backfill_entries(batch_size=400):
+    db = get_db()
+    batch, pending, updated = db.batch(), 0, 0
+    owners = set()
+    for doc in db.collection(JOURNALS).select(["entry", "preview", "user_id"]).stream():
+        data = doc.to_dict()
+        fields = {}
+        if "preview" not in data and data.get("entry"):
+            fields["preview"] = preview_text(data["entry"])
+        if "user_id" not in data:
+            fields["user_id"] = LEGACY_USER_ID
+        if not fields:
+            continue
+        batch.update(doc.reference, fields)
+        owners.add(data.get("user_id", LEGACY_USER_ID))
+        pending += 1
+        updated += 1
+        if pending >= batch_size:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    invalidate(*(journals_tag(owner) for owner in owners))
+    return updated
+
+
+if __name__ == "__main__":
+    print(f"Backfilled {backfill_entries()} entries")
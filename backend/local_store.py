@@ -0,0 +1,15 @@
+import os
+
+# 📁 Local state directory (response cache, queues, snapshots)
+# Override with ECHOSOUL_DATA_DIR when the repo folder is read-only.
+_DEFAULT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.echosoul'))
+
+
+def data_dir(*parts):
+    path = os.path.join(os.getenv("ECHOSOUL_DATA_DIR", _DEFAULT_DIR), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(*parts):
+    return os.path.join(data_dir(*parts[:-1]), parts[-1])
@@ -0,0 +1,59 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+# ⚙️ Per-model generation settings (override with set_generation_config)
+MODEL_CONFIGS = {
+    "gemini-1.5-flash": {"temperature": 0.9, "max_output_tokens": 1024},
+}
+
+_lock = threading.Lock()
+_genai = None
+_models = {}
+
+
+def _configure():
+    # google.generativeai is imported on first use so importing pages stays cheap
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        load_dotenv()
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _genai = genai
+    return _genai
+
+
+# 🔮 One GenerativeModel per model name for the whole process. The SDK client
+# (and its gRPC channel) is created on first use and reused by every session.
+def get_model(model_name=DEFAULT_MODEL):
+    model = _models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _models.get(model_name)
+            if model is None:
+                genai = _configure()
+                model = genai.GenerativeModel(model_name, generation_config=MODEL_CONFIGS.get(model_name))
+                _models[model_name] = model
+    return model
+
+
+def set_generation_config(model_name, **config):
+    with _lock:
+        MODEL_CONFIGS[model_name] = {**MODEL_CONFIGS.get(model_name, {}), **config}
+        _models.pop(model_name, None)  # rebuilt with the new config on next use
+
+
+# 🔥 Open the transport before the first real request. count_tokens is a
+# cheap probe that does not spend generation quota.
+def warm_up(model_names=None):
+    status = {}
+    for model_name in model_names or list(MODEL_CONFIGS):
+        try:
+            get_model(model_name).count_tokens("ping")
+            status[model_name] = "ready"
+        except Exception as e:
+            print(f"Gemini warm-up error ({model_name}): {e}")
+            status[model_name] = "error"
+    return status
@@ -0,0 +1,110 @@
+import time
+import threading
+from functools import wraps
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 🗃️ Process-wide cache for Firestore read results, shared by every page and session.
+# Fresh results are served directly; results past their TTL but inside the
+# stale window are served instantly while one background refresh runs.
+# Writes call invalidate(tag) so a user never reads around their own write.
+
+MAX_ENTRIES = 512
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # key -> {"value", "fetched_at", "tags", "refreshing"}
+_tag_epochs = {}           # tag -> bumped on every invalidation
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
+_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="echosoul-cache")
+
+
+def _freeze(value):
+    # Hashable stand-in for query arguments (dates, lists, Firestore snapshots)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if hasattr(value, "reference") and hasattr(value.reference, "path"):
+        return ("doc", value.reference.path)
+    return value
+
+
+def _epochs(tags):
+    return tuple(_tag_epochs.get(tag, 0) for tag in tags)
+
+
+def _store(key, value, tags, epochs):
+    with _lock:
+        entry = _entries.get(key)
+        if _epochs(tags) != epochs:
+            # A write invalidated these tags while we were loading: drop the result
+            if entry:
+                entry["refreshing"] = False
+            return
+        _entries[key] = {"value": value, "fetched_at": time.monotonic(), "tags": tags, "refreshing": False}
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _refresh(key, loader, tags, epochs):
+    try:
+        _store(key, loader(), tags, epochs)
+    except Exception as e:
+        print(f"Query cache refresh error: {e}")
+        with _lock:
+            if key in _entries:
+                _entries[key]["refreshing"] = False
+
+
+def get_or_load(key, loader, tags=(), ttl=30, stale_ttl=300):
+    tags = tuple(tags)
+    with _lock:
+        entry = _entries.get(key)
+        epochs = _epochs(tags)
+        if entry:
+            age = time.monotonic() - entry["fetched_at"]
+            if age < ttl:
+                _entries.move_to_end(key)
+                _stats["hits"] += 1
+                return entry["value"]
+            if age < ttl + stale_ttl:
+                _stats["stale_hits"] += 1
+                if not entry["refreshing"]:
+                    entry["refreshing"] = True
+                    _stats["refreshes"] += 1
+                    _refresher.submit(_refresh, key, loader, tags, epochs)
+                return entry["value"]
+        _stats["misses"] += 1
+
+    value = loader()
+    _store(key, value, tags, epochs)
+    return value
+
+
+def invalidate(*tags):
+    with _lock:
+        for tag in tags:
+            _tag_epochs[tag] = _tag_epochs.get(tag, 0) + 1
+        stale_keys = [key for key, entry in _entries.items() if set(entry["tags"]) & set(tags)]
+        for key in stale_keys:
+            del _entries[key]
+        _stats["invalidations"] += len(stale_keys)
+
+
+def stats():
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
+
+
+# 🎀 Decorator form. tags is a tuple or a callable receiving the call's arguments.
+def cached_query(namespace, tags=(), ttl=30, stale_ttl=300):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (namespace, _freeze(args), _freeze(kwargs))
+            call_tags = tags(*args, **kwargs) if callable(tags) else tags
+            return get_or_load(key, lambda: fn(*args, **kwargs), call_tags, ttl, stale_ttl)
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
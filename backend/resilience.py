@@ -0,0 +1,149 @@
+import time
+import random
+import threading
+
+from backend.executor import remaining
+
+# 🛡️ Resilience for outbound Gemini calls:
+#   classify(error)   -> quota / timeout / server / client / unknown
+#   CircuitBreaker    -> opens after consecutive failed requests (at once on quota),
+#                        fails fast while open, lets one probe through after cooldown
+#   call(fn, ...)     -> jittered retries for transient errors inside a latency budget;
+#                        one breaker outcome per request, however many attempts it took.
+#                        Each attempt gets request_options={"timeout": ...} set to
+#                        what is left of min(budget, executor deadline).
+# Client errors (bad prompt, auth) say nothing about Gemini's health and
+# never count towards opening the breaker.
+# While the breaker is open, callers get CircuitOpenError in microseconds and
+# fall back to the local mood engine and canned texts.
+
+QUOTA, TIMEOUT, SERVER, CLIENT, UNKNOWN = "quota", "timeout", "server", "client", "unknown"
+RETRYABLE = {TIMEOUT, SERVER}
+
+DEFAULT_BUDGET_SECONDS = 12
+MAX_RETRIES = 2
+BASE_BACKOFF_SECONDS = 0.25
+MIN_ATTEMPT_SECONDS = 0.1
+
+_QUOTA_NAMES = {"ResourceExhausted", "TooManyRequests"}
+_TIMEOUT_NAMES = {"DeadlineExceeded", "TimeoutError", "Timeout", "ReadTimeout", "ConnectTimeout"}
+_SERVER_NAMES = {"ServiceUnavailable", "InternalServerError", "BadGateway", "GatewayTimeout", "Unknown", "Aborted"}
+_CLIENT_NAMES = {"InvalidArgument", "PermissionDenied", "Unauthenticated", "NotFound", "BadRequest", "FailedPrecondition"}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def classify(error):
+    name = type(error).__name__
+    code = getattr(error, "code", None)
+    code = code if isinstance(code, int) else None
+    if name in _QUOTA_NAMES or code == 429 or "quota" in str(error).lower():
+        return QUOTA
+    if name in _TIMEOUT_NAMES or isinstance(error, TimeoutError) or code == 504:
+        return TIMEOUT
+    if name in _SERVER_NAMES or (code is not None and code >= 500):
+        return SERVER
+    if name in _CLIENT_NAMES or (code is not None and 400 <= code < 500):
+        return CLIENT
+    return UNKNOWN
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=4, reset_timeout=30, quota_timeout=120):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.quota_timeout = quota_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._stats = {"successes": 0, "failures": 0, "rejected": 0, "trips": 0, "client_errors": 0,
+                       "last_error": None}
+
+    @property
+    def state(self):
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                return "open"
+            return "half_open" if self._open_until else "closed"
+
+    # 🚦 True if a call may go out; while half-open only one probe at a time
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                self._stats["rejected"] += 1
+                return False
+            if self._open_until:
+                if self._probing:
+                    self._stats["rejected"] += 1
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+            self._probing = False
+            self._stats["successes"] += 1
+
+    def record_failure(self, kind=UNKNOWN):
+        with self._lock:
+            if kind == CLIENT:
+                self._probing = False  # the request was at fault, not the service
+                self._stats["client_errors"] += 1
+                return
+            self._failures += 1
+            self._stats["failures"] += 1
+            self._stats["last_error"] = kind
+            if kind == QUOTA or self._probing or self._failures >= self.failure_threshold:
+                cooldown = self.quota_timeout if kind == QUOTA else self.reset_timeout
+                self._open_until = time.monotonic() + cooldown
+                self._stats["trips"] += 1
+                print(f"⚡ Circuit '{self.name}' open for {cooldown}s after {kind} error")
+            self._probing = False
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            return {**self._stats, "state": state, "consecutive_failures": self._failures}
+
+
+gemini_breaker = CircuitBreaker("gemini")
+
+
+def backoff(attempt):
+    return BASE_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+# 🔁 Run fn through the breaker; retry transient errors while the budget allows
+def call(fn, *args, breaker=gemini_breaker, budget=DEFAULT_BUDGET_SECONDS, retries=MAX_RETRIES, **kwargs):
+    # A deadline propagated from the executor caps the budget
+    left = remaining()
+    deadline = time.monotonic() + (budget if left is None else min(budget, left))
+    options = dict(kwargs.pop("request_options", None) or {})
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} circuit is open")
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        timeout = max(deadline - started, MIN_ATTEMPT_SECONDS)
+        try:
+            result = fn(*args, request_options={**options, "timeout": timeout}, **kwargs)
+        except Exception as e:
+            kind = classify(e)
+            delay = backoff(attempt)
+            # Only retry if another attempt as slow as this one still fits the budget
+            if kind in RETRYABLE and attempt < retries and \
+                    time.monotonic() + delay + (time.monotonic() - started) < deadline:
+                attempt += 1
+                time.sleep(delay)
+                continue
+            breaker.record_failure(kind)
+            raise
+        breaker.record_success()
+        return result
@@ -0,0 +1,144 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from backend.local_store import data_path
+
+# ⚙️ Tunables (env overrides for Streamlit Cloud secrets)
+MEMORY_LIMIT_BYTES = int(os.getenv("ECHOSOUL_CACHE_MEMORY_BYTES", 2 * 1024 * 1024))
+DEFAULT_TTL_SECONDS = int(os.getenv("ECHOSOUL_CACHE_TTL", 7 * 24 * 3600))
+
+
+def normalize_prompt(prompt):
+    # Whitespace-only differences should not produce a new Gemini call
+    return " ".join(str(prompt).split())
+
+
+def cache_key(model_name, prompt):
+    raw = f"{model_name}\x00{normalize_prompt(prompt)}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+# 🗃️ Two-tier cache: in-process LRU (byte bounded) in front of SQLite on disk
+class ResponseCache:
+    def __init__(self, path=None, memory_limit=MEMORY_LIMIT_BYTES, ttl=DEFAULT_TTL_SECONDS):
+        self.path = path or data_path("responses.sqlite3")
+        self.memory_limit = memory_limit
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (text, expires_at, size)
+        self._memory_bytes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._conn = None
+
+    # 🗄️ Disk tier
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    # 🧠 Memory tier
+    def _remember(self, key, text, expires_at):
+        size = len(text.encode("utf-8"))
+        if size > self.memory_limit:
+            return
+        old = self._memory.pop(key, None)
+        if old:
+            self._memory_bytes -= old[2]
+        self._memory[key] = (text, expires_at, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_limit:
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+    def _forget(self, key):
+        old = self._memory.pop(key, None)
+        if old:
+            self._memory_bytes -= old[2]
+
+    def get(self, model_name, prompt):
+        key = cache_key(model_name, prompt)
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit and hit[1] > now:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return hit[0]
+            if hit:
+                self._forget(key)
+
+            try:
+                row = self._db().execute(
+                    "SELECT text, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Response cache read error: {e}")
+                row = None
+
+            if row and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self._stats["disk_hits"] += 1
+                return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, model_name, prompt, text, ttl=None):
+        if not text:
+            return
+        key = cache_key(model_name, prompt)
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, text, expires_at)
+            try:
+                conn = self._db()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, text, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, model_name, text, now, expires_at)
+                )
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache write error: {e}")
+            self._stats["writes"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            try:
+                conn = self._db()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache clear error: {e}")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# 🌍 Process-wide instance shared by every Streamlit session
+response_cache = ResponseCache()
@@ -0,0 +1,185 @@
+import os
+import sys
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from firebase_admin import firestore
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.firebase_config import get_db
+from backend.query_cache import cached_query, invalidate
+from utils.mood_analysis import MOOD_SCORES
+
+# 📊 Per-day and per-week mood aggregates, updated at write time
+#   rollups/{user_id}/days/{YYYY-MM-DD}_{shard}
+#   rollups/{user_id}/weeks/{YYYY-Www}_{shard}
+# Each period is split over NUM_SHARDS docs so concurrent writers rarely
+# touch the same document; readers add the shards back together.
+
+ROLLUPS = "rollups"
+NUM_SHARDS = 4
+COUNTERS = ("journal_count", "journal_score_sum", "reflection_count", "rating_sum", "rating_count")
+MOOD_MAPS = ("journal_moods", "reflection_moods")
+
+
+def rollup_tag(user_id):
+    return f"{ROLLUPS}/{user_id}"
+
+
+def day_key(day):
+    return day.isoformat()
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _shard_refs(user_id, day):
+    shard = random.randrange(NUM_SHARDS)
+    user_ref = get_db().collection(ROLLUPS).document(user_id)
+    week_start = day - timedelta(days=day.weekday())
+    return [
+        (user_ref.collection("days").document(f"{day_key(day)}_{shard}"), day_key(day), day),
+        (user_ref.collection("weeks").document(f"{week_key(day)}_{shard}"), week_key(day), week_start),
+    ]
+
+
+def _increment(writer, user_id, when, fields, mood_map, mood, sign):
+    day = when.date() if isinstance(when, datetime) else when
+    update = {name: firestore.Increment(sign * value) for name, value in fields.items()}
+    update[mood_map] = {mood: firestore.Increment(sign)}
+    for ref, period, start in _shard_refs(user_id, day):
+        writer.set(ref, {"period": period, "start": start.isoformat(), **update}, merge=True)
+
+
+# ✍️ Queue counter updates on a transaction or batch; sign=-1 undoes a write
+def record_journal(writer, user_id, mood, when, sign=1):
+    mood = (mood or "unknown").lower()
+    fields = {"journal_count": 1, "journal_score_sum": MOOD_SCORES.get(mood, 0)}
+    _increment(writer, user_id, when, fields, "journal_moods", mood, sign)
+
+
+# 🧮 Undo a journal's counts inside a transaction without pushing any shard
+# below zero (entries written before rollups existed were never counted).
+# Reads every shard of the entry's day and week, so call it before the
+# transaction's first write; returns the write as a callable taking it.
+def journal_removal(transaction, user_id, mood, when):
+    mood = (mood or "unknown").lower()
+    day = when.date() if isinstance(when, datetime) else when
+    db = get_db()
+    writes = []
+    for kind, key in (("days", day_key(day)), ("weeks", week_key(day))):
+        period = db.collection(ROLLUPS).document(user_id).collection(kind)
+        refs = [period.document(f"{key}_{shard}") for shard in range(NUM_SHARDS)]
+        shards = [(snap.reference, snap.to_dict() or {}) for snap in db.get_all(refs, transaction=transaction)]
+        counted = next((ref for ref, data in shards if data.get("journal_count", 0) >= 1), None)
+        if counted:
+            writes.append((counted, {
+                "journal_count": firestore.Increment(-1),
+                "journal_score_sum": firestore.Increment(-MOOD_SCORES.get(mood, 0))
+            }))
+        mood_counted = next((ref for ref, data in shards if (data.get("journal_moods") or {}).get(mood, 0) >= 1), None)
+        if mood_counted:
+            writes.append((mood_counted, {"journal_moods": {mood: firestore.Increment(-1)}}))
+
+    def write(writer):
+        for ref, update in writes:
+            writer.set(ref, update, merge=True)
+    return write
+
+
+def record_reflection(writer, user_id, mood, rating, when, sign=1):
+    fields = {"reflection_count": 1}
+    if isinstance(rating, (int, float)):
+        fields.update(rating_sum=rating, rating_count=1)
+    _increment(writer, user_id, when, fields, "reflection_moods", (mood or "unknown").lower(), sign)
+
+
+def _empty():
+    return {**dict.fromkeys(COUNTERS, 0), **{name: defaultdict(int) for name in MOOD_MAPS}}
+
+
+def _merge(total, data):
+    for name in COUNTERS:
+        total[name] += data.get(name, 0)
+    for name in MOOD_MAPS:
+        for mood, count in (data.get(name) or {}).items():
+            total[name][mood] += count
+    return total
+
+
+def _read(user_id, kind, first_key, last_key):
+    periods = defaultdict(_empty)
+    docs = get_db().collection(ROLLUPS).document(user_id).collection(kind)\
+        .where("period", ">=", first_key)\
+        .where("period", "<=", last_key)\
+        .stream()
+    for doc in docs:
+        data = doc.to_dict()
+        _merge(periods[data["period"]], data)["start"] = data.get("start")
+    return dict(sorted(periods.items()))
+
+
+# 📖 {"YYYY-MM-DD": aggregate} for every day with activity in the range
+@cached_query("rollup_days", tags=lambda user_id, *args: (rollup_tag(user_id),))
+def read_days(user_id, start_day, end_day):
+    return _read(user_id, "days", day_key(start_day), day_key(end_day))
+
+
+# 📖 {"YYYY-Www": aggregate} for every ISO week with activity in the range
+@cached_query("rollup_weeks", tags=lambda user_id, *args: (rollup_tag(user_id),))
+def read_weeks(user_id, start_day, end_day):
+    return _read(user_id, "weeks", week_key(start_day), week_key(end_day))
+
+
+def combine(aggregates):
+    total = _empty()
+    for data in aggregates:
+        _merge(total, data)
+    return total
+
+
+def mood_counts(aggregate, sources=MOOD_MAPS):
+    counts = defaultdict(int)
+    for name in sources:
+        for mood, count in aggregate[name].items():
+            if count > 0:
+                counts[mood] += count
+    return dict(counts)
+
+
+# 🧱 One-off backfill for entries written before rollups existed
+def rebuild_rollups(user_id, legacy_user_id="demo_user"):
+    db = get_db()
+    for doc in db.collection(ROLLUPS).document(user_id).collection("days").stream():
+        doc.reference.delete()
+    for doc in db.collection(ROLLUPS).document(user_id).collection("weeks").stream():
+        doc.reference.delete()
+
+    counted = 0
+    for collection, record in (("journals", record_journal), ("reflections", record_reflection)):
+        batch, pending = db.batch(), 0
+        for doc in db.collection(collection).stream():
+            data = doc.to_dict()
+            if data.get("user_id", legacy_user_id) != user_id or not data.get("created_at"):
+                continue
+            if collection == "journals":
+                record(batch, user_id, data.get("mood"), data["created_at"])
+            else:
+                record(batch, user_id, data.get("mood"), data.get("rating"), data["created_at"])
+            pending += 1
+            counted += 1
+            if pending >= 200:  # two writes per entry, under the 500-op batch limit
+                batch.commit()
+                batch, pending = db.batch(), 0
+        if pending:
+            batch.commit()
+    invalidate(rollup_tag(user_id))
+    return counted
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "demo_user"
+    print(f"Rolled up {rebuild_rollups(target)} entries for {target}")
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field, field_validator
+
+
+# 🧾 Structured Gemini responses (validated before anything is shown or saved)
+class MoodFeedback(BaseModel):
+    mood: str = Field(description="One lowercase mood label, e.g. happy, sad, anxious, calm")
+    feedback: str = Field(description="One helpful sentence for the writer")
+
+    @field_validator("mood")
+    @classmethod
+    def _clean_mood(cls, value):
+        value = value.strip().strip(".").lower()
+        return value or "unknown"
+
+    @field_validator("feedback")
+    @classmethod
+    def _clean_feedback(cls, value):
+        return value.lstrip("1234567890.:- ").strip() or "no feedback provided."
+
+
+class JournalAnalysis(MoodFeedback):
+    affirmation: str = Field(description="A personalized one-sentence affirmation")
+    weekly_goal: str = Field(description="One achievable goal for the coming week")
+    comfort_food: str = Field(description="The comfort food the story is about")
+    comfort_story: str = Field(description="A short, cozy, uplifting story about making the comfort food")
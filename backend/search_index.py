@@ -0,0 +1,209 @@
+import os
+import sys
+import math
+import zlib
+from collections import defaultdict
+from firebase_admin import firestore
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.firebase_config import get_db
+from backend.query_cache import cached_query, invalidate
+from utils.text_index import tokenize, term_frequencies, words, stem, partial_stems
+
+# 🔎 Per-user inverted index, maintained at write time
+#   search_index/{user_id}                          -> {"entry_count": N}
+#   search_index/{user_id}/terms/{stem}_{bucket}    -> {"postings": {entry_id: term_frequency}}
+# A term's postings are spread over POSTING_BUCKETS docs by entry ID, so a
+# common term stays far below Firestore's per-document field and size limits.
+# "postings" is exempt from indexing (fieldOverrides in firestore.indexes.json).
+
+INDEX = "search_index"
+POSTING_BUCKETS = 16
+MAX_TERMS_PER_ENTRY = 200  # indexed inside the entry's transaction; the rest via index_overflow()
+TERMS_PER_BATCH = 400      # Firestore allows 500 writes per batch
+PREFIX_EXPANSION = 25      # max index terms a single query prefix may expand to
+
+
+def _user_ref(user_id):
+    return get_db().collection(INDEX).document(user_id)
+
+
+def search_tag(user_id):
+    return f"{INDEX}/{user_id}"
+
+
+def _bucket(entry_id):
+    return zlib.crc32(entry_id.encode("utf-8")) % POSTING_BUCKETS
+
+
+def _postings_ref(user_id, term, entry_id):
+    return _user_ref(user_id).collection("terms").document(f"{term}_{_bucket(entry_id)}")
+
+
+def _stem_of(doc_id):
+    return doc_id.rsplit("_", 1)[0]  # stems never contain "_"
+
+
+def _set_postings(writer, user_id, entry_id, postings):
+    for term, value in postings:
+        writer.set(_postings_ref(user_id, term, entry_id), {"postings": {entry_id: value}}, merge=True)
+
+
+# ✍️ Queue index writes on a transaction or batch (anything with set/update).
+# Only the MAX_TERMS_PER_ENTRY most frequent terms fit; index_overflow() adds the rest.
+def add_to_index(writer, user_id, entry_id, text, count=True):
+    _set_postings(writer, user_id, entry_id, list(term_frequencies(text, MAX_TERMS_PER_ENTRY).items()))
+    if count:
+        writer.set(_user_ref(user_id), {"entry_count": firestore.Increment(1)}, merge=True)
+
+
+def remove_from_index(writer, user_id, entry_id, text):
+    terms = term_frequencies(text, MAX_TERMS_PER_ENTRY)
+    _set_postings(writer, user_id, entry_id, [(term, firestore.DELETE_FIELD) for term in terms])
+    writer.set(_user_ref(user_id), {"entry_count": firestore.Increment(-1)}, merge=True)
+
+
+# 📚 Terms past MAX_TERMS_PER_ENTRY, committed in their own batches once the
+# entry is saved (or deleted). Idempotent, so a retried save simply rewrites them.
+def index_overflow(user_id, entry_id, text, remove=False):
+    overflow = list(term_frequencies(text).items())[MAX_TERMS_PER_ENTRY:]
+    if remove:
+        overflow = [(term, firestore.DELETE_FIELD) for term, _ in overflow]
+    db = get_db()
+    for start in range(0, len(overflow), TERMS_PER_BATCH):
+        batch = db.batch()
+        _set_postings(batch, user_id, entry_id, overflow[start:start + TERMS_PER_BATCH])
+        batch.commit()
+    return len(overflow)
+
+
+class SearchResults(list):
+    truncated = False  # True if a prefix matched more than PREFIX_EXPANSION terms
+
+
+def _id_range(user_id, start, end, limit):
+    terms = _user_ref(user_id).collection("terms")
+    return list(terms.where(firestore.FieldPath.document_id(), ">=", terms.document(start))
+                .where(firestore.FieldPath.document_id(), "<", terms.document(end))
+                .limit(limit).stream())
+
+
+# Returns (docs, truncated). Over the cap, the last term read may be missing
+# buckets, so all of its docs are dropped rather than scored on partial postings.
+def _expand_prefix(user_id, prefix):
+    cap = PREFIX_EXPANSION * POSTING_BUCKETS
+    docs = _id_range(user_id, prefix, prefix + "\uf8ff", cap + 1)
+    if len(docs) <= cap:
+        return docs, False
+    last = _stem_of(docs[-1].id)
+    return [doc for doc in docs if _stem_of(doc.id) != last], True
+
+
+# All bucket docs of one exact index term
+def _term_docs(user_id, term):
+    return _id_range(user_id, f"{term}_", f"{term}_\uf8ff", POSTING_BUCKETS)
+
+
+# 🔎 (stem, partial word or None) per query term; the last word counts as
+# still being typed unless the query ends in whitespace
+def _query_terms(query):
+    typed = words(query)
+    partial = typed[-1] if typed and not query[-1:].isspace() else None
+    terms = {stem(word): None for word in typed}
+    if partial:
+        terms[stem(partial)] = partial
+    return list(terms.items())
+
+
+# 🏆 Ranked AND search: every query term (as a prefix) must match; the last,
+# possibly half-typed word also matches index terms it runs past.
+# Reads only the matching postings docs plus the top-ranked entries.
+@cached_query("search", tags=lambda user_id, *args, **kwargs: (search_tag(user_id),))
+def search(user_id, query, limit=20, collection="journals", fields=None):
+    query_terms = _query_terms(query)
+    if not query_terms:
+        return SearchResults()
+
+    meta = _user_ref(user_id).get().to_dict() or {}
+    total_entries = max(meta.get("entry_count", 1), 1)
+
+    matches = None
+    truncated = False
+    scores = defaultdict(float)
+    for term, partial in query_terms:
+        term_docs, cut = _expand_prefix(user_id, term)
+        truncated |= cut
+        if partial:
+            for candidate in partial_stems(partial):
+                term_docs += _term_docs(user_id, candidate)
+
+        # Merge each index term's buckets before weighting it
+        term_postings = defaultdict(dict)
+        for term_doc in {doc.id: doc for doc in term_docs}.values():
+            term_postings[_stem_of(term_doc.id)].update((term_doc.to_dict() or {}).get("postings", {}))
+
+        term_scores = defaultdict(float)
+        for postings in term_postings.values():
+            if not postings:
+                continue
+            idf = math.log(1 + total_entries / len(postings))
+            for entry_id, tf in postings.items():
+                term_scores[entry_id] += (1 + math.log(tf)) * idf
+
+        matches = set(term_scores) if matches is None else matches & set(term_scores)
+        if not matches:
+            results = SearchResults()
+            results.truncated = truncated
+            return results
+        for entry_id in matches:
+            scores[entry_id] += term_scores[entry_id]
+
+    ranked = sorted(matches, key=lambda entry_id: scores[entry_id], reverse=True)[:limit]
+    db = get_db()
+    refs = [db.collection(collection).document(entry_id) for entry_id in ranked]
+    docs = {doc.id: doc for doc in db.get_all(refs, field_paths=fields) if doc.exists}
+    results = SearchResults(docs[entry_id] for entry_id in ranked if entry_id in docs)
+    results.truncated = truncated
+    return results
+
+
+def _clear_terms(user_id):
+    db = get_db()
+    while True:
+        docs = list(_user_ref(user_id).collection("terms").limit(TERMS_PER_BATCH).stream())
+        if not docs:
+            return
+        batch = db.batch()
+        for doc in docs:
+            batch.delete(doc.reference)
+        batch.commit()
+
+
+# 🧱 Full rebuild: backfills entries written before the index existed and
+# moves postings from the old one-doc-per-term layout into buckets
+def rebuild_index(user_id, collection="journals"):
+    db = get_db()
+    _clear_terms(user_id)
+    batch, pending, indexed = db.batch(), 0, 0
+    for doc in db.collection(collection).stream():
+        data = doc.to_dict()
+        if data.get("user_id", user_id) != user_id or not data.get("entry"):
+            continue
+        add_to_index(batch, user_id, doc.id, data["entry"], count=False)
+        index_overflow(user_id, doc.id, data["entry"])
+        pending += 1
+        indexed += 1
+        if pending >= 2:  # each entry can queue up to MAX_TERMS_PER_ENTRY + 1 writes
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    _user_ref(user_id).set({"entry_count": indexed}, merge=True)
+    invalidate(search_tag(user_id))
+    return indexed
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "demo_user"
+    print(f"Indexed {rebuild_index(target)} entries for {target}")
@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.local_store import data_dir, data_path
+from backend.query_cache import cached_query, invalidate
+
+# 🧊 Local columnar snapshot of journals and reflections
+#   .echosoul/snapshot/{collection}/year=YYYY/month=M/part-*.parquet
+#   .echosoul/snapshot/{collection}_watermark.json -> {"written_at": ISO}
+# sync() pulls only documents committed after the watermark, so a refresh
+# costs one read per new entry. The watermark tracks the server-set
+# written_at, not created_at: the write queue commits entries with their
+# original (earlier) created_at, sometimes minutes later. Without a
+# watermark (first run, legacy docs without written_at) sync() rebuilds.
+# Queries go through pyarrow.dataset with filters (partition + row-group
+# pruning) and column projection.
+#   python -m backend.snapshot            # incremental sync
+#   python -m backend.snapshot --rebuild  # drop and re-pull (picks up edits / deletes)
+
+SNAPSHOT = "snapshot"
+SYNC_PAGE_SIZE = 1000
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+LEGACY_USER_ID = "demo_user"
+
+COLUMNS = {
+    "journals": ["id", "user_id", "mood", "preview", "engine", "source", "created_at"],
+    "reflections": ["id", "user_id", "mood", "rating", "text", "created_at"],
+}
+
+
+def snapshot_tag(collection):
+    return f"{SNAPSHOT}/{collection}"
+
+
+def _schema(collection):
+    import pyarrow as pa
+
+    types = {"rating": pa.float64(), "created_at": pa.timestamp("us", tz="UTC")}
+    return pa.schema([(name, types.get(name, pa.string())) for name in COLUMNS[collection]])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("year", pa.int32()), ("month", pa.int32())]), flavor="hive")
+
+
+def _base_dir(collection):
+    return data_dir(SNAPSHOT, collection)
+
+
+def _watermark_path(collection):
+    return data_path(SNAPSHOT, f"{collection}_watermark.json")
+
+
+def load_watermark(collection):
+    path = _watermark_path(collection)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        value = json.load(f).get("written_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+def _save_watermark(collection, written_at):
+    path = _watermark_path(collection)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"written_at": written_at.isoformat()}, f)
+    os.replace(tmp, path)  # atomic, like the reclassify checkpoint
+
+
+def _row(collection, doc):
+    data = doc.to_dict()
+    created_at = data.get("created_at")
+    if created_at is None:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    row = {name: data.get(name) for name in COLUMNS[collection]}
+    row.update(
+        id=doc.id,
+        user_id=data.get("user_id", LEGACY_USER_ID),
+        mood=str(data.get("mood") or "unknown").lower(),
+        created_at=created_at,
+    )
+    if collection == "journals" and not row["preview"]:
+        row["preview"] = (data.get("entry") or "")[:140]
+    if collection == "reflections":
+        row["rating"] = float(row["rating"]) if isinstance(row["rating"], (int, float)) else None
+    return row
+
+
+def _write(collection, rows):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pylist(rows, schema=_schema(collection))
+    table = table.append_column("year", pc.year(table["created_at"]).cast(pa.int32()))
+    table = table.append_column("month", pc.month(table["created_at"]).cast(pa.int32()))
+    ds.write_dataset(
+        table, _base_dir(collection), format="parquet", partitioning=_partitioning(),
+        basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+
+# 📥 Page through query, appending rows; returns (synced, ids, latest written_at).
+# With track=True the watermark advances after every page, so an interrupted
+# sync resumes where it stopped.
+def _pull(collection, query, skip=frozenset(), track=False):
+    synced, ids, latest, cursor = 0, set(), None, None
+    while True:
+        page = query.start_after(cursor) if cursor else query
+        docs = list(page.limit(SYNC_PAGE_SIZE).stream())
+        if not docs:
+            break
+        rows = []
+        for doc in docs:
+            written_at = doc.to_dict().get("written_at")
+            if written_at and (latest is None or written_at > latest):
+                latest = written_at
+            row = _row(collection, doc) if doc.id not in skip else None
+            if row:
+                rows.append(row)
+                ids.add(doc.id)
+        if rows:
+            _write(collection, rows)
+            synced += len(rows)
+        if track and latest:
+            _save_watermark(collection, latest)
+        cursor = docs[-1]
+    return synced, ids, latest
+
+
+# 🔄 Incremental sync: pull documents committed after the watermark
+def sync(collection="journals"):
+    from firebase_admin import firestore
+    from backend.firebase_config import get_db
+
+    watermark = load_watermark(collection)
+    if watermark is None:
+        return rebuild(collection)
+
+    started = time.perf_counter()
+    query = get_db().collection(collection).where("written_at", ">", watermark)\
+        .order_by("written_at", direction=firestore.Query.ASCENDING)
+    synced, _, _ = _pull(collection, query, track=True)
+    if synced:
+        invalidate(snapshot_tag(collection))
+    print(f"🧊 Snapshot {collection}: {synced} new rows in {time.perf_counter() - started:.1f}s")
+    return synced
+
+
+# 🧱 Drop and re-pull everything (picks up edits, deletes and legacy docs).
+# The watermark is taken before the full scan; the catch-up pass after it
+# skips IDs the scan already wrote, so nothing committed meanwhile is lost.
+def rebuild(collection="journals"):
+    from firebase_admin import firestore
+    from backend.firebase_config import get_db
+
+    shutil.rmtree(_base_dir(collection), ignore_errors=True)
+    if os.path.exists(_watermark_path(collection)):
+        os.remove(_watermark_path(collection))
+    invalidate(snapshot_tag(collection))
+
+    started = time.perf_counter()
+    docs = get_db().collection(collection)
+    newest = list(docs.order_by("written_at", direction=firestore.Query.DESCENDING).limit(1).stream())
+    watermark = (newest[0].to_dict().get("written_at") if newest else None) or EPOCH
+
+    synced, ids, _ = _pull(collection, docs.order_by("created_at", direction=firestore.Query.ASCENDING))
+    _save_watermark(collection, watermark)
+    caught_up, _, _ = _pull(collection, docs.where("written_at", ">", watermark)
+                            .order_by("written_at", direction=firestore.Query.ASCENDING), skip=ids, track=True)
+    invalidate(snapshot_tag(collection))
+    print(f"🧊 Snapshot {collection}: rebuilt {synced + caught_up} rows in {time.perf_counter() - started:.1f}s")
+    return synced + caught_up
+
+
+# 🔎 Filtered, column-pruned read. `where` is a pyarrow.dataset expression.
+def query(collection, columns=None, where=None):
+    import pyarrow.dataset as ds
+
+    base = _base_dir(collection)
+    if not any(name.startswith("year=") for name in os.listdir(base)):
+        table = _schema(collection).empty_table()
+        return table.select([name for name in columns if name in table.column_names]) if columns else table
+    dataset = ds.dataset(base, format="parquet", partitioning=_partitioning())
+    return dataset.to_table(columns=columns, filter=where)
+
+
+def _user_year_filter(user_id, year):
+    import pyarrow.dataset as ds
+
+    where = ds.field("user_id") == user_id
+    return where & (ds.field("year") == year) if year else where
+
+
+# 📆 Year in review: totals, mood mix, entries per month and busiest weekday
+@cached_query("snapshot_year", tags=lambda user_id, *args: (snapshot_tag("journals"),), ttl=300)
+def year_in_review(user_id, year):
+    import pyarrow.compute as pc
+
+    table = query("journals", ["mood", "created_at", "month"], _user_year_filter(user_id, year))
+    if table.num_rows == 0:
+        return {"entries": 0, "moods": {}, "by_month": {}, "busiest_weekday": None}
+
+    def counts(values):
+        return {item["values"]: item["counts"] for item in pc.value_counts(values).to_pylist()}
+
+    weekdays = counts(pc.day_of_week(table["created_at"]))
+    return {
+        "entries": table.num_rows,
+        "moods": counts(table["mood"]),
+        "by_month": dict(sorted(counts(table["month"]).items())),
+        "busiest_weekday": max(weekdays, key=weekdays.get),  # 0 = Monday
+    }
+
+
+# ⭐ Average reflection rating per mood
+@cached_query("snapshot_mood_rating", tags=lambda user_id, *args: (snapshot_tag("reflections"),), ttl=300)
+def mood_vs_rating(user_id, year=None):
+    import pyarrow.dataset as ds
+
+    where = _user_year_filter(user_id, year) & ds.field("rating").is_valid()
+    table = query("reflections", ["mood", "rating"], where)
+    if table.num_rows == 0:
+        return {}
+    stats = table.group_by("mood").aggregate([("rating", "mean"), ("rating", "count")])
+    return {
+        mood: (round(mean, 2), count)
+        for mood, mean, count in zip(stats["mood"].to_pylist(), stats["rating_mean"].to_pylist(),
+                                     stats["rating_count"].to_pylist())
+    }
+
+
+# 📈 (dates, moods) arrays for trend pages, e.g. utils.timeseries
+def mood_series(user_id, start, end):
+    import pyarrow.dataset as ds
+
+    where = (ds.field("user_id") == user_id) \
+        & (ds.field("year") >= start.year) & (ds.field("year") <= end.year) \
+        & (ds.field("created_at") >= datetime.combine(start, datetime.min.time(), timezone.utc)) \
+        & (ds.field("created_at") <= datetime.combine(end, datetime.max.time(), timezone.utc))
+    table = query("journals", ["created_at", "mood"], where).sort_by("created_at")
+    return table["created_at"].to_numpy(), table["mood"].to_numpy(zero_copy_only=False)
+
+
+if __name__ == "__main__":
+    refresh = rebuild if "--rebuild" in sys.argv else sync
+    for name in COLUMNS:
+        refresh(name)
@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import importlib
+import threading
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.local_store import data_path
+
+# 📮 Durable write-behind queue for journal, reflection and story saves.
+# enqueue() returns once the write is committed to SQLite (WAL, fsync'd),
+# so submit latency no longer depends on Firestore. One background flusher
+# drains rows in enqueue order per user: a failing row is retried with
+# backoff and blocks only that user's later rows, so each user's saves land
+# in the order written while other users keep flushing. Only errors that
+# prove the payload itself is bad (InvalidArgument, oversized document,
+# schema validation) go straight to dead_writes; contention, credential and
+# outage errors retry up to MAX_ATTEMPTS. requeue_dead() replays dead rows.
+# Replays are safe because document IDs are idempotency keys.
+#   python -m backend.write_queue [timeout]         # drain inline
+#   python -m backend.write_queue --requeue-dead    # move dead_writes back, then drain
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 12          # then the row moves to dead_writes for inspection
+MAX_BACKOFF_SECONDS = 300
+IDLE_POLL_SECONDS = 5
+BAD_PAYLOAD_NAMES = {"InvalidArgument", "ValidationError"}  # Firestore / pydantic, matched by name
+BAD_PAYLOAD_MESSAGES = ("exceeds the maximum allowed size", "too large")
+
+# kind -> (module, function); resolved on first flush like main.PAGES
+HANDLERS = {
+    "journal": ("backend.journal_repository", "save_journal_entry"),
+    "reflection": ("backend.journal_repository", "save_reflection"),
+}
+
+
+# 🧪 True only if no retry can ever succeed: the stored payload is the problem.
+# Transaction contention (a ValueError from @transactional), PermissionDenied,
+# NotFound and outages all retry.
+def is_bad_payload(error):
+    if isinstance(error, (TypeError, json.JSONDecodeError)):
+        return True  # payload no longer matches the handler, or is not valid JSON
+    if type(error).__name__ in BAD_PAYLOAD_NAMES:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in BAD_PAYLOAD_MESSAGES)
+
+
+class WriteQueue:
+    def __init__(self, path=None, handlers=HANDLERS):
+        self.path = path or data_path("write_queue.sqlite3")
+        self.handlers = handlers
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._conn = None
+        self._stats = {"enqueued": 0, "flushed": 0, "failures": 0, "dead": 0,
+                       "last_error": None, "last_flush_lag": None}
+
+    # 🗄️ Storage
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")  # an acknowledged save survives a crash
+            for table in ("pending_writes", "dead_writes"):
+                self._conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        owner TEXT,
+                        payload TEXT NOT NULL,
+                        enqueued_at REAL NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        next_attempt_at REAL NOT NULL DEFAULT 0,
+                        last_error TEXT
+                    )
+                """)
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if "owner" not in columns:  # queue files from before per-user ordering
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN owner TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pending_by_owner ON pending_writes (owner, seq)")
+            self._conn.commit()
+        return self._conn
+
+    def enqueue(self, kind, payload):
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown write kind: {kind}")
+        with self._lock:
+            conn = self._db()
+            cursor = conn.execute(
+                "INSERT INTO pending_writes (kind, owner, payload, enqueued_at) VALUES (?, ?, ?, ?)",
+                (kind, payload.get("user_id"), json.dumps(payload), time.time())
+            )
+            conn.commit()
+            self._stats["enqueued"] += 1
+        self.start()
+        self._wake.set()
+        return cursor.lastrowid
+
+    def _handler(self, kind):
+        module_name, func_name = self.handlers[kind]
+        return getattr(importlib.import_module(module_name), func_name)
+
+    # 🚚 Drain up to BATCH_SIZE due rows in order. A row waits while an
+    # earlier row of the same user is backing off or failed in this pass.
+    def flush_once(self):
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT seq, kind, owner, payload, enqueued_at, attempts FROM pending_writes AS p "
+                "WHERE next_attempt_at <= :now AND NOT EXISTS ("
+                "    SELECT 1 FROM pending_writes AS q "
+                "    WHERE q.owner IS p.owner AND q.seq < p.seq AND q.next_attempt_at > :now) "
+                "ORDER BY seq LIMIT :limit", {"now": time.time(), "limit": BATCH_SIZE}
+            ).fetchall()
+
+        flushed, blocked = 0, set()
+        for seq, kind, owner, payload, enqueued_at, attempts in rows:
+            if owner in blocked:
+                continue
+            try:
+                self._handler(kind)(**json.loads(payload))
+            except Exception as e:
+                if self._record_failure(seq, attempts + 1, e):
+                    blocked.add(owner)  # retrying: this user's later rows wait
+                continue
+            with self._lock:
+                self._db().execute("DELETE FROM pending_writes WHERE seq = ?", (seq,))
+                self._db().commit()
+                self._stats["flushed"] += 1
+                self._stats["last_flush_lag"] = time.time() - enqueued_at
+            flushed += 1
+        return flushed
+
+    # Returns True if the row stays queued for a retry
+    def _record_failure(self, seq, attempts, error):
+        permanent = is_bad_payload(error)
+        print(f"Write queue flush error (seq {seq}, attempt {attempts}"
+              f"{', permanent' if permanent else ''}): {error}")
+        with self._lock:
+            conn = self._db()
+            self._stats["failures"] += 1
+            self._stats["last_error"] = str(error)
+            if permanent or attempts >= MAX_ATTEMPTS:
+                conn.execute(
+                    "INSERT INTO dead_writes (seq, kind, owner, payload, enqueued_at, attempts, last_error) "
+                    "SELECT seq, kind, owner, payload, enqueued_at, ?, ? FROM pending_writes WHERE seq = ?",
+                    (attempts, str(error), seq)
+                )
+                conn.execute("DELETE FROM pending_writes WHERE seq = ?", (seq,))
+                self._stats["dead"] += 1
+            else:
+                backoff = min(2 ** attempts, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1.0)
+                conn.execute(
+                    "UPDATE pending_writes SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE seq = ?",
+                    (attempts, time.time() + backoff, str(error), seq)
+                )
+            conn.commit()
+            return not (permanent or attempts >= MAX_ATTEMPTS)
+
+    def _run(self):
+        while True:
+            try:
+                flushed = self.flush_once()
+            except Exception as e:
+                print(f"Write queue error: {e}")
+                flushed = 0
+            if not flushed:
+                self._wake.wait(IDLE_POLL_SECONDS)
+                self._wake.clear()
+
+    # 🧵 One flusher thread per process; safe to call repeatedly
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="echosoul-write-queue", daemon=True)
+                self._thread.start()
+        return self._thread
+
+    # ⏳ Flush inline until empty or timeout (CLI / shutdown)
+    def drain(self, timeout=30):
+        deadline = time.time() + timeout
+        while self.depth() and time.time() < deadline:
+            if not self.flush_once():
+                time.sleep(0.5)
+        return self.depth()
+
+    # ♻️ Move dead rows (all, or the given seqs) back to the queue with a
+    # fresh attempt budget; they keep their seq, so per-user order holds
+    def requeue_dead(self, seqs=None):
+        where, params = ("", ()) if not seqs else (
+            f" WHERE seq IN ({', '.join('?' * len(seqs))})", tuple(seqs))
+        with self._lock:
+            conn = self._db()
+            moved = conn.execute(
+                "INSERT INTO pending_writes (seq, kind, owner, payload, enqueued_at) "
+                f"SELECT seq, kind, owner, payload, enqueued_at FROM dead_writes{where}", params
+            ).rowcount
+            conn.execute(f"DELETE FROM dead_writes{where}", params)
+            conn.commit()
+        if moved:
+            self._wake.set()
+        return moved
+
+    def depth(self):
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM pending_writes").fetchone()[0]
+
+    # 📏 Queue depth and flush lag (age of the oldest unflushed write)
+    def stats(self):
+        with self._lock:
+            depth, oldest = self._db().execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM pending_writes"
+            ).fetchone()
+            dead = self._db().execute("SELECT COUNT(*) FROM dead_writes").fetchone()[0]
+            return {**self._stats, "depth": depth, "dead_letters": dead,
+                    "lag_seconds": time.time() - oldest if oldest else 0.0}
+
+
+write_queue = WriteQueue()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--requeue-dead"]
+    if "--requeue-dead" in sys.argv:
+        print(f"♻️ Requeued {write_queue.requeue_dead()} dead writes")
+    remaining = write_queue.drain(timeout=float(args[0]) if args else 60)
+    print(f"📮 {write_queue.stats()['flushed']} flushed, {remaining} still queued")
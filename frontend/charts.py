@@ -0,0 +1,129 @@
+import io
+import streamlit as st
+
+# 📈 Memoized chart builders. Every builder takes plain tuples of aggregated
+# data, so st.cache_data keys on the data itself: an unchanged dataset
+# reuses the cached figure instead of rebuilding it on every rerun.
+# Heavy plotting libraries are imported inside the builders (see main.py).
+
+MAX_FIGURES = 32  # per builder, across all sessions
+WEBGL_THRESHOLD = 500  # points above which traces switch to WebGL
+
+MOOD_COLORS = {
+    "happy": "#FFD700", "excited": "#FF8C00", "grateful": "#32CD32", "hopeful": "#00CED1",
+    "calm": "#87CEFA", "reflective": "#A9A9A9", "unclear": "#D3D3D3",
+    "anxious": "#FF6347", "sad": "#4682B4", "lonely": "#6A5ACD", "angry": "#DC143C", "error": "#808080"
+}
+
+TREND_COLORS = {
+    "angry": "#1E90FF",
+    "happy": "#32CD32",
+    "sad": "#FF0000",
+    "neutral": "#800080",
+    "frustrated": "#808080"
+}
+
+
+# 🍰 Pie chart from ((mood, count), ...), largest first
+@st.cache_data(max_entries=MAX_FIGURES, show_spinner=False)
+def mood_pie(mood_counts):
+    import plotly.express as px
+
+    moods = sorted(mood_counts, key=lambda kv: -kv[1])
+    fig = px.pie(names=[m for m, _ in moods], values=[c for _, c in moods], title="Mood Distribution",
+                 color=[m for m, _ in moods], color_discrete_map=MOOD_COLORS,
+                 hole=0.3)
+    fig.update_traces(textinfo='percent+label', pull=[0.05]*len(moods))
+    fig.update_layout(paper_bgcolor="black", font=dict(color="white"))
+    return fig
+
+
+# 📈 Average mood score per period from ((iso_date, score), ...)
+@st.cache_data(max_entries=MAX_FIGURES, show_spinner=False)
+def score_trend(points):
+    import plotly.graph_objects as go
+
+    trace = go.Scattergl if len(points) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure()
+    fig.add_trace(trace(
+        x=[day for day, _ in points],
+        y=[score for _, score in points],
+        mode="lines+markers",
+        line=dict(color="#1E90FF", width=4),
+        marker=dict(size=10, symbol="circle", color="#1E90FF"),
+        hovertemplate="<b>Date:</b> %{x}<br><b>Avg Mood Score:</b> %{y:.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Mood Score Over Time",
+        xaxis_title="Date",
+        yaxis_title="Mood Score",
+        xaxis=dict(showgrid=True, tickangle=0),
+        yaxis=dict(showgrid=True, zeroline=True),
+        font=dict(color="yellow", size=16),
+        plot_bgcolor="#e6f2ff",
+        paper_bgcolor="black",
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig
+
+
+# 📊 Bar chart rendered once to PNG bytes. Uses a bare Figure (not pyplot),
+# so nothing is left in pyplot's global registry and the figure is freed
+# as soon as the bytes are written.
+@st.cache_data(max_entries=MAX_FIGURES, show_spinner=False)
+def mood_bar_png(mood_counts):
+    from matplotlib.figure import Figure
+
+    moods = sorted(mood_counts, key=lambda kv: -kv[1])
+    fig = Figure(figsize=(8, 5), facecolor="#000000")
+    ax = fig.subplots()
+    ax.bar([m for m, _ in moods], [c for _, c in moods], color="#FFD700")
+    ax.set_facecolor("#000000")
+    ax.set_title("Mood Frequency (Last 7 Days)", color="white")
+    ax.set_xlabel("Mood", color="white")
+    ax.set_ylabel("Frequency", color="white")
+    ax.tick_params(colors="white")
+    for spine in ax.spines.values():
+        spine.set_color("white")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor(), bbox_inches="tight")
+    fig.clear()
+    return buffer.getvalue()
+
+
+# 📈 One line per mood from ((iso_date, ((mood, count), ...)), ...)
+@st.cache_data(max_entries=MAX_FIGURES, show_spinner=False)
+def mood_trend_lines(mood_by_day):
+    import plotly.graph_objects as go
+
+    days = [day for day, _ in mood_by_day]
+    counts_by_day = [dict(counts) for _, counts in mood_by_day]
+    moods = sorted({mood for counts in counts_by_day for mood in counts})
+
+    fig = go.Figure()
+    for mood in moods:
+        fig.add_trace(go.Scatter(
+            x=days,
+            y=[counts.get(mood, 0) for counts in counts_by_day],
+            mode="lines+markers",
+            name=mood,
+            line=dict(color=TREND_COLORS.get(mood, "#FFD700"), width=3),
+            marker=dict(size=8, color=TREND_COLORS.get(mood, "#FFD700")),
+            hovertemplate=f"<b>{mood}</b><br>Date: %{{x}}<br>Count: %{{y}}<extra></extra>"
+        ))
+    fig.update_layout(
+        title="Mood Trends by Day",
+        xaxis_title="Date",
+        yaxis_title="Count",
+        font=dict(color="white", size=14),
+        plot_bgcolor="#111111",
+        paper_bgcolor="black",
+        margin=dict(l=40, r=40, t=60, b=40),
+        legend=dict(
+            bgcolor="#222222",
+            bordercolor="#FFD700",
+            borderwidth=1
+        )
+    )
+    return fig
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from backend.jobs import get_job, submit_job
+
+# 🔁 Session-side half of backend.jobs: the job ID lives in session_state,
+# a fragment polls it while it runs and one app rerun shows the final text.
+# The finished text is copied into session_state, so the card outlives the
+# job's eviction from the shared job table.
+
+POLL_SECONDS = 0.75
+
+
+def _text_key(state_key):
+    return f"{state_key}_text"
+
+
+def start_job(state_key, fn, *args, key=None, **kwargs):
+    st.session_state.pop(_text_key(state_key), None)
+    st.session_state[state_key] = submit_job(fn, *args, key=key, **kwargs)
+    return st.session_state[state_key]
+
+
+def clear_job(state_key):
+    st.session_state.pop(state_key, None)
+    st.session_state.pop(_text_key(state_key), None)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(state_key, render, pending_text):
+    job = get_job(st.session_state.get(state_key))
+    if job is None or job["done"]:
+        st.rerun()  # whole page: render the final result outside the fragment
+    render(job["text"] + " ▌" if job["text"] else pending_text, False)
+
+
+# 📺 render(text, done) draws the card. Returns the job snapshot (or None).
+def show_job(state_key, render, pending_text="⏳ Working on it..."):
+    saved = st.session_state.get(_text_key(state_key))
+    if saved is not None:
+        render(saved, True)
+        return {"id": st.session_state.get(state_key), "status": "done", "text": saved,
+                "result": saved, "error": None, "done": True}
+    job = get_job(st.session_state.get(state_key))
+    if job is None:
+        clear_job(state_key)  # never started, or evicted before it was shown
+        return None
+    if job["done"] and job["error"] and not job["text"]:
+        st.warning("⏳ EchoSoul is busy right now. Please try again in a moment.")
+    elif job["done"]:
+        st.session_state[_text_key(state_key)] = job["text"]
+        render(job["text"], True)
+    else:
+        _poll(state_key, render, pending_text)
+    return job
+
+
+# ⏳ For jobs whose result feeds later steps rather than a card: returns the
+# snapshot once finished (None if unknown); while running, a fragment shows
+# pending_text and reruns the page when the job completes.
+def await_job(state_key, pending_text="⏳ Working on it..."):
+    job = get_job(st.session_state.get(state_key))
+    if job is not None and not job["done"]:
+        _poll(state_key, lambda text, done: st.info(text), pending_text)
+    return job
@@ -1,93 +1,21 @@
 import streamlit as st
 import sys
 import os
-from datetime import datetime
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.ai_services import analyze_mood, generate_affirmation_and_goal, generate_comfort_story
-from backend.firebase_config import db
-from backend.firebase_utils import update_streak
+from frontend.theme import inject_theme
+from backend.ai_services import analyze_journal, gemini_available, generate_affirmation_and_goal, stream_comfort_story
+from backend.journal_repository import queue_journal_entry
+from frontend.job_view import start_job, show_job, await_job, clear_job
+from utils.mood_analysis import analyze_text
 
 # Temporary user ID for testing (replace with Firebase Auth later)
 user_id = "demo_user"
 
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .glow-box {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-bottom: 20px;
-        }
-        .recipe-card {
-            background-color: #1a1a1a;
-            border-radius: 10px;
-            padding: 15px;
-            margin: 10px 0;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        @keyframes pulse {
-            0% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-            50% { transform: scale(1.1); box-shadow: 0 0 30px #FFD700; }
-            100% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-        }
-        @media screen and (max-width: 768px) {
-            h1, h2, h3 {
-                font-size: 1.5rem;
-            }
-            .stButton>button {
-                padding: 8px 16px;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
 def basic_mood_detector(text):
-    text = text.lower()
-    if "sad" in text or "lonely" in text:
-        return "sad", "You seem down—take a moment to breathe."
-    elif "happy" in text or "excited" in text:
-        return "happy", "Glad you're feeling good!"
-    elif "anxious" in text or "overwhelmed" in text or "worried" in text:
-        return "anxious", "Try grounding yourself—you're doing great."
-    elif "calm" in text or "peaceful" in text:
-        return "calm", "Enjoy the serenity."
-    elif "angry" in text or "frustrated" in text:
-        return "angry", "Let it out—your feelings are valid."
-    elif "grateful" in text or "thankful" in text:
-        return "grateful", "Gratitude is powerful—keep it flowing."
-    elif "hopeful" in text or "optimistic" in text:
-        return "hopeful", "Hope is a strength—hold onto it."
-    elif "reflective" in text or "thinking" in text:
-        return "reflective", "Reflection brings clarity—keep exploring."
-    else:
-        return "unclear", "Couldn't detect mood clearly."
+    result = analyze_text(text)
+    return result.mood, result.feedback
 
 # 🍽️ Mood-to-Recipe mapping
 MOOD_TO_RECIPES = {
@@ -102,9 +30,42 @@ MOOD_TO_RECIPES = {
     "unclear": ["Rice Bowl", "Dal", "Chai"]
 }
 
+# ✅ Turn an analysis (Gemini's, or None for the local engine) into the
+# queued entry and the result cards kept in session_state
+def _finish_analysis(text, persona_name, local, analysis, gemini_requested=False):
+    notice = None
+    if analysis:
+        mood, feedback = analysis.mood, analysis.feedback
+    else:
+        if gemini_requested:
+            # 🧯 Route to the local engine instead of asking the user to switch
+            notice = "🔮 Gemini is unavailable right now, so the local mood engine answered."
+        local = local or analyze_text(text)
+        mood, feedback = local.mood, local.feedback
+
+    recipes = MOOD_TO_RECIPES.get(mood.lower(), ["Rice Bowl", "Dal", "Chai"])
+
+    # 📮 Persisted locally at once; entry + streak reach Firestore in the background
+    _, streak = queue_journal_entry(
+        user_id, text, mood, feedback,
+        engine="🔮 Gemini" if analysis else "🧠 Fallback"
+    )
+
+    # 🧰 Kept in session_state so reruns and page switches don't lose the cards
+    result = {"mood": mood, "feedback": feedback, "persona": persona_name, "notice": notice,
+              "recipes": recipes, "streak": streak, "affirmation": None, "story": None}
+    if analysis:
+        result["affirmation"] = f"Affirmation: {analysis.affirmation}\nWeekly Goal: {analysis.weekly_goal}"
+        result["story"] = analysis.comfort_story
+    else:
+        # 🚀 Both Gemini cards generate in the background
+        start_job("journal_affirmation_job", generate_affirmation_and_goal, text, persona_name)
+        start_job("journal_story_job", stream_comfort_story, recipes[0], mood)
+    st.session_state.journal_result = result
+
 def run_journal():
     st.set_page_config(page_title="EchoSoul Journal", layout="centered")
-    inject_bugatti_css()
+    inject_theme("journal")
     st.title("📝 EchoSoul Journal")
     st.subheader("Let your thoughts echo...")
 
@@ -118,61 +79,79 @@ def run_journal():
     }
 
     user_input = st.text_area("Write your journal entry here:", height=200)
-    engine_choice = st.radio("Choose mood analysis engine:", ["🔮 Gemini", "🧠 Fallback"], horizontal=True)
+    engine_choice = st.radio("Choose mood analysis engine:", ["⚡ Auto", "🔮 Gemini", "🧠 Fallback"], horizontal=True)
 
     if st.button("Analyze Mood"):
         if user_input.strip():
-            with st.spinner("Analyzing your mood..."):
-                mood, feedback = None, None
-                if engine_choice == "🔮 Gemini":
-                    try:
-                        mood, feedback = analyze_mood(user_input)
-                        if not mood or not feedback:
-                            raise ValueError("Empty Gemini response")
-                    except Exception:
-                        st.warning("Gemini failed or quota exceeded. Try fallback mode.")
-                        return
-                else:
-                    mood, feedback = basic_mood_detector(user_input)
-
-                emoji = MOOD_EMOJIS.get(mood.lower(), "📝")
-                st.markdown(f"<div class='glow-box'><h3>🧠 Mood: {emoji} {mood.capitalize()}</h3><p>🗣️ {persona_name} says: {feedback}</p></div>", unsafe_allow_html=True)
-
-                # Save journal entry
-                db.collection("journals").add({
-                    "entry": user_input,
-                    "mood": mood,
-                    "feedback": feedback,
-                    "engine": engine_choice,
-                    "created_at": datetime.now()
-                })
-
-                # Update streak
-                streak = update_streak(user_id)
-                if streak >= 3:
-                    st.markdown(f"""
-                    <div style="text-align:center;">
-                        <div style="display:inline-block; padding:20px; border-radius:50%; background:#FFD700; box-shadow:0 0 20px #FFD700; animation:pulse 2s infinite;">
-                            <h2 style="color:black;">🔥 Streak: {streak} Days</h2>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                # 🌟 Affirmation + Goal
-                response = generate_affirmation_and_goal(user_input, persona_name)
-                st.markdown(f"<div class='glow-box'><h3>🌟 Affirmation & Goal</h3><p>{response}</p></div>", unsafe_allow_html=True)
-
-                # 🍽️ Mood-Based Recipe Suggestions
-                st.markdown("<h3>🍽️ Suggested Recipes Based on Your Mood</h3>", unsafe_allow_html=True)
-                recipes = MOOD_TO_RECIPES.get(mood.lower(), ["Rice Bowl", "Dal", "Chai"])
-                for r in recipes:
-                    st.markdown(f"<div class='recipe-card'>🍴 {r}</div>", unsafe_allow_html=True)
-
-                # 📖 Comfort Food Story (Gemini)
-                try:
-                    story = generate_comfort_story(recipes[0], mood)
-                    st.markdown(f"<div class='glow-box'><h3>📖 Comfort Food Story</h3><p>{story}</p></div>", unsafe_allow_html=True)
-                except Exception:
-                    st.warning("Could not generate story. Gemini may be unavailable.")
+            local = analyze_text(user_input) if engine_choice != "🔮 Gemini" else None
+            # ⚡ Auto: trust the local engine unless the entry is ambiguous
+            use_gemini = engine_choice == "🔮 Gemini" or (engine_choice == "⚡ Auto" and local.ambiguous)
+            if use_gemini and engine_choice == "⚡ Auto" and not gemini_available():
+                use_gemini = False  # Gemini is down: skip the call entirely
+            st.session_state.pop("journal_result", None)
+            if use_gemini:
+                # 🚀 One structured call returns mood, feedback, affirmation, goal and story;
+                # it runs as a job so a rerun or page switch doesn't cancel it
+                st.session_state.journal_pending = {"text": user_input, "persona": persona_name, "local": local}
+                start_job("journal_analysis_job", analyze_journal, user_input, persona_name, MOOD_TO_RECIPES)
+            else:
+                st.session_state.pop("journal_pending", None)
+                _finish_analysis(user_input, persona_name, local, None)
         else:
-            st.warning("Please write something before analyzing.")
\ No newline at end of file
+            st.warning("Please write something before analyzing.")
+
+    pending = st.session_state.get("journal_pending")
+    if pending:
+        job = await_job("journal_analysis_job", "⏳ Analyzing your mood...")
+        if job is not None and not job["done"]:
+            return
+        st.session_state.pop("journal_pending")
+        clear_job("journal_analysis_job")
+        _finish_analysis(pending["text"], pending["persona"], pending["local"], job["result"] if job else None,
+                         gemini_requested=True)
+
+    result = st.session_state.get("journal_result")
+    if not result:
+        return
+
+    if result.get("notice"):
+        st.info(result["notice"])
+
+    mood = result["mood"]
+    emoji = MOOD_EMOJIS.get(mood.lower(), "📝")
+    st.markdown(f"<div class='glow-box'><h3>🧠 Mood: {emoji} {mood.capitalize()}</h3><p>🗣️ {result['persona']} says: {result['feedback']}</p></div>", unsafe_allow_html=True)
+
+    streak = result["streak"]
+    if streak and streak >= 3:
+        st.markdown(f"""
+        <div style="text-align:center;">
+            <div style="display:inline-block; padding:20px; border-radius:50%; background:#FFD700; box-shadow:0 0 20px #FFD700; animation:pulse 2s infinite;">
+                <h2 style="color:black;">🔥 Streak: {streak} Days</h2>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # 🌟 Affirmation + Goal
+    def show_affirmation(response, done=True):
+        if done and not response:
+            response = "Affirmation: You're doing great.\nWeekly Goal: Stay consistent and reflect daily."
+        st.markdown(f"<div class='glow-box'><h3>🌟 Affirmation & Goal</h3><p>{response}</p></div>", unsafe_allow_html=True)
+
+    if result["affirmation"]:
+        show_affirmation(result["affirmation"])
+    else:
+        show_job("journal_affirmation_job", show_affirmation, "⏳ Crafting your affirmation...")
+
+    # 🍽️ Mood-Based Recipe Suggestions
+    st.markdown("<h3>🍽️ Suggested Recipes Based on Your Mood</h3>", unsafe_allow_html=True)
+    for r in result["recipes"]:
+        st.markdown(f"<div class='recipe-card'>🍴 {r}</div>", unsafe_allow_html=True)
+
+    # 📖 Comfort Food Story (Gemini), streamed in while the job runs
+    def show_story(story, done=True):
+        st.markdown(f"<div class='glow-box'><h3>📖 Comfort Food Story</h3><p>{story}</p></div>", unsafe_allow_html=True)
+
+    if result["story"]:
+        show_story(result["story"])
+    else:
+        show_job("journal_story_job", show_story, "⏳ Writing your comfort food story...")
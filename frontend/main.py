@@ -1,128 +1,72 @@
 import streamlit as st
 import sys
 import os
+import time
+import importlib
+import threading
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from frontend.theme import inject_theme
+from backend.model_registry import warm_up
+from backend import firebase_config
+from backend.write_queue import write_queue
+from backend.resilience import gemini_breaker
+from backend.content_pool import content_pool
 
-# Import page modules
-from frontend.journal import run_journal
-from pages.history import run_history
-from frontend.dashboard import run_dashboard
-from pages.reflection import run_reflection
-from pages.booster import run_booster
-from pages.weekly import run_weekly_summary
-from pages.mood_dashboard import run_mood_dashboard  # ✅ Include this
-
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .glow-box {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-bottom: 20px;
-        }
-        .reflection {
-            transform: scaleY(-1);
-            opacity: 0.2;
-            filter: blur(2px);
-        }
-        @keyframes pulse {
-            0% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-            50% { transform: scale(1.1); box-shadow: 0 0 30px #FFD700; }
-            100% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-        }
-        @media screen and (max-width: 768px) {
-            h1, h2, h3 {
-                font-size: 1.5rem;
-            }
-            .stButton>button {
-                padding: 8px 16px;
-            }
-        }
-        /* Sidebar Styling */
-section[data-testid="stSidebar"] {
-    background: linear-gradient(145deg, #0a0a0a, #1a1a1a);
-    border-right: 2px solid #FFD700;
-    box-shadow: 0 0 20px #FFD700;
-    padding-top: 20px;
+# 🗂️ Page registry: a page module is imported only when it is first selected
+PAGES = {
+    "📝 Journal": ("frontend.journal", "run_journal"),
+    "📜 History": ("pages.history", "run_history"),
+    "📊 Dashboard": ("frontend.dashboard", "run_dashboard"),
+    "🪞 Reflection": ("pages.reflection", "run_reflection"),
+    "🎯 Booster": ("pages.booster", "run_booster"),
+    "🧠 Weekly Summary": ("pages.weekly", "run_weekly_summary"),
+    "📊 Mood Dashboard": ("pages.mood_dashboard", "run_mood_dashboard"),
 }
 
-/* Sidebar Title */
-section[data-testid="stSidebar"] h1, section[data-testid="stSidebar"] h2 {
-    color: #FFD700;
-    text-shadow: 0 0 10px #FFD700;
-}
+# ⏱️ Import cost per page module, kept for the life of the server process
+@st.cache_resource
+def import_timings():
+    return {}
 
-/* Sidebar Radio Buttons */
-div[data-testid="stSidebarNav"] label {
-    color: #ffffff !important;
-    font-weight: bold;
-    padding: 8px 12px;
-    border-radius: 8px;
-    transition: all 0.3s ease;
-    display: block;
-}
-
-div[data-testid="stSidebarNav"] label:hover {
-    background-color: #FFD700;
-    color: #000000 !important;
-    box-shadow: 0 0 10px #FFD700;
-    transform: translateX(5px);
-}
-
-/* Selected Option Glow */
-div[data-testid="stSidebarNav"] input:checked + div label {
-    background-color: #FFD700;
-    color: #000000 !important;
-    box-shadow: 0 0 15px #FFD700;
-    transform: scale(1.05);
-}
-
-/* Sidebar Icons (if using emojis) */
-div[data-testid="stSidebarNav"] label::before {
-    content: "⚡ ";
-    color: #FFD700;
-    margin-right: 5px;
-    transition: transform 0.3s ease;
-}
+def load_page(label):
+    module_name, func_name = PAGES[label]
+    timings = import_timings()
+    if module_name not in sys.modules:
+        started = time.perf_counter()
+        importlib.import_module(module_name)
+        timings[module_name] = (time.perf_counter() - started) * 1000
+        print(f"⏱️ Imported {module_name} in {timings[module_name]:.0f} ms")
+    return getattr(sys.modules[module_name], func_name), timings.get(module_name)
 
-div[data-testid="stSidebarNav"] label:hover::before {
-    transform: rotate(20deg);
-}        
-    </style>
-    """, unsafe_allow_html=True)
+# 🔥 Warm Gemini and Firestore clients once per server process, off the script thread
+@st.cache_resource
+def start_warm_up():
+    threads = [
+        threading.Thread(target=warm_up, name="echosoul-warm-up", daemon=True),
+        threading.Thread(target=firebase_config.warm_up, name="echosoul-firestore-warm-up", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    write_queue.start()  # drains saves left over from a previous run
+    content_pool.warm()  # tops up Booster / Weekly pools in the background
+    return threads
 
 # 🚀 Page setup
+start_warm_up()
 st.sidebar.markdown("#### 🔖 jagadishsprojects")
 st.set_page_config(page_title="EchoSoul", layout="wide")
-inject_bugatti_css()  # Inject elite styling
+inject_theme()  # Inject elite styling
 st.sidebar.title("🧭 EchoSoul Navigation")
+ready, detail = firebase_config.readiness()  # result of the warm-up probe; never blocks
+if ready is False:
+    st.sidebar.warning(f"⚠️ Firestore unavailable: {detail}")
+if gemini_breaker.state == "open":
+    st.sidebar.caption("🧯 Gemini unavailable · using local fallbacks")
+queued = write_queue.stats()
+if queued["depth"]:
+    st.sidebar.caption(f"📮 {queued['depth']} saves syncing · oldest {queued['lag_seconds']:.0f}s")
 
 # 🎞️ Optional Hero Section (can move to index/dashboard)
 st.markdown("""
@@ -133,28 +77,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 🧭 Navigation
-page = st.sidebar.radio("Go to:", [
-    "📝 Journal",
-    "📜 History",
-    "📊 Dashboard",
-    "🪞 Reflection",
-    "🎯 Booster",
-    "🧠 Weekly Summary",
-    "📊 Mood Dashboard"
-])
+page = st.sidebar.radio("Go to:", list(PAGES))
 
 # 🔀 Page routing
-if page == "📝 Journal":
-    run_journal()
-elif page == "📜 History":
-    run_history()
-elif page == "📊 Dashboard":
-    run_dashboard()
-elif page == "🪞 Reflection":
-    run_reflection()
-elif page == "🎯 Booster":
-    run_booster()
-elif page == "🧠 Weekly Summary":
-    run_weekly_summary()
-elif page == "📊 Mood Dashboard":
-    run_mood_dashboard()
+run_page, import_ms = load_page(page)
+started = time.perf_counter()
+run_page()
+st.sidebar.caption(
+    f"⏱️ import {import_ms:.0f} ms · render {(time.perf_counter() - started) * 1000:.0f} ms"
+    if import_ms is not None else f"⏱️ render {(time.perf_counter() - started) * 1000:.0f} ms"
+)
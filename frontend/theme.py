@@ -0,0 +1,25 @@
+import os
+from functools import lru_cache
+import streamlit as st
+
+# 🎨 One theme for the whole app.
+#   frontend/static/css/base.css     -> shared look, injected by main.py
+#   frontend/static/css/{page}.css   -> page-specific extensions
+# Each sheet is read from disk once per process and inlined as a <style> block.
+
+CSS_DIR = os.path.join(os.path.dirname(__file__), "static", "css")
+
+
+@lru_cache(maxsize=None)
+def _stylesheet(name):
+    path = os.path.join(CSS_DIR, f"{name}.css")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def inject_theme(page=None):
+    css = _stylesheet(page or "base")
+    if css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
@@ -1,106 +1,14 @@
 import streamlit as st
 import sys
 import os
-from backend.ai_services import generate_affirmation
+from html import escape
+from backend.ai_services import stream_affirmation
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .affirmation-box {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-top: 20px;
-            font-size: 18px;
-            font-style: italic;
-        }
-        .mood-header {
-            font-size: 24px;
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-            font-weight: bold;
-            margin-top: 30px;
-            text-align: center;
-        }
-        .video-row {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 20px;
-            align-items: flex-start;
-            margin-top: 20px;
-        }
-        .video-card {
-            flex: 1 1 320px;
-            max-width: 320px;
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-            border-radius: 12px;
-            overflow: hidden;
-            box-shadow: 0 0 10px #FFD700;
-            animation: fadeIn 0.8s ease-in-out;
-        }
-        .video-card:hover {
-            transform: scale(1.05);
-            box-shadow: 0 0 20px #FFD700;
-        }
-        .video-summary {
-            flex: 1 1 300px;
-            font-size: 16px;
-            color: #DDDDDD;
-            font-style: italic;
-            line-height: 1.6;
-            padding: 10px;
-            border-left: 2px solid #FFD700;
-            animation: fadeInText 1s ease-in-out;
-        }
-        iframe {
-            border: none;
-            border-radius: 12px;
-        }
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        @keyframes fadeInText {
-            from { opacity: 0; transform: translateY(10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        @media screen and (max-width: 768px) {
-            .video-row {
-                flex-direction: column;
-            }
-            .video-summary {
-                padding: 0;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+from frontend.theme import inject_theme
+from frontend.job_view import start_job, show_job, clear_job
+from backend.content_pool import content_pool
 
 # 🎥 Mood-based video sets with summaries
 MOOD_VIDEOS = {
@@ -192,7 +100,7 @@ MOOD_VIDEOS = {
 
 def run_booster():
     st.set_page_config(page_title="EchoSoul Booster", layout="centered")
-    inject_bugatti_css()
+    inject_theme("booster")
 
     st.markdown("""
         <div style='text-align: center; padding: 20px;'>
@@ -203,10 +111,25 @@ def run_booster():
 
     mood = st.selectbox("Pick your mood:", list(MOOD_VIDEOS.keys()))
 
+    # 🫙 Served instantly from the pre-generated pool; a background job
+    # generates live only when the pool for this mood is empty
+    state_key, text_key = f"booster_job_{mood}", f"booster_text_{mood}"
     if st.button("Get Affirmation"):
-        with st.spinner("Generating affirmation..."):
-            affirmation = generate_affirmation(mood)
-        st.markdown(f"<div class='affirmation-box'>💬 {affirmation}</div>", unsafe_allow_html=True)
+        pooled = content_pool.take("affirmation", mood)
+        if pooled:
+            st.session_state[text_key] = pooled
+            clear_job(state_key)
+        else:
+            st.session_state.pop(text_key, None)
+            start_job(state_key, stream_affirmation, mood, key=("affirmation", mood))
+
+    def show_affirmation(text, done):
+        st.markdown(f"<div class='affirmation-box'>💬 {escape(text)}</div>", unsafe_allow_html=True)
+
+    if text_key in st.session_state:
+        show_affirmation(st.session_state[text_key], True)
+    else:
+        show_job(state_key, show_affirmation, "⏳ Finding the right words...")
 
     st.markdown("<div class='mood-header'>🎵 Here's something to lift your mood:</div>", unsafe_allow_html=True)
 
@@ -4,72 +4,40 @@ import os
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.firebase_config import db
-from firebase_admin import firestore
+from frontend.theme import inject_theme
+from html import escape
+from backend.journal_repository import PREVIEW_FIELDS, delete_journal_entry, fetch_journal_entry, fetch_journal_page
+from backend.search_index import search
 
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 8px 16px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .entry-card {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-bottom: 20px;
-        }
-        .entry-card:hover {
-            box-shadow: 0 0 30px #FFD700;
-        }
-        .entry-header {
-            font-size: 18px;
-            font-weight: bold;
-            color: #FFD700;
-        }
-        .entry-text {
-            font-size: 16px;
-            color: #DDDDDD;
-        }
-        .entry-caption {
-            font-size: 14px;
-            color: #AAAAAA;
-        }
-        @media screen and (max-width: 768px) {
-            h1 {
-                font-size: 1.5rem;
-            }
-            .entry-card {
-                padding: 15px;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+# Temporary user ID for testing (replace with Firebase Auth later)
+user_id = "demo_user"
+
+PAGE_SIZE = 10
+SEARCH_LIMIT = 20
+
+ROW_TEMPLATE = (
+    '<div class="entry-card"><div class="entry-header">{emoji} {mood}</div>'
+    '<div class="entry-text">{preview}</div>'
+    '<div class="entry-caption">🕒 {timestamp}</div></div>\n'
+)
+
+def show_entry(doc_id):
+    data = fetch_journal_entry(doc_id)
+    if not data:
+        st.warning("This entry no longer exists.")
+        return
+    feedback = data.get("feedback", "").lstrip("1234567890.:- ").strip()
+    with st.container(border=True):
+        st.markdown(f"**🗣️ Feedback:** {escape(feedback)}" if feedback else "**🗣️ Feedback:** —")
+        st.text(data.get("entry", ""))
+        if st.button("🗑️ Delete Entry", key=f"delete_{doc_id}"):
+            delete_journal_entry(doc_id)
+            st.success("Entry deleted.")
+            st.rerun()
 
 def run_history():
     st.set_page_config(page_title="EchoSoul History", layout="centered")
-    inject_bugatti_css()
+    inject_theme("history")
 
     st.markdown("""
         <div style='text-align: center; padding: 20px;'>
@@ -88,46 +56,78 @@ def run_history():
         "All", "Happy", "Sad", "Anxious", "Calm", "Angry", "Grateful",
         "Hopeful", "Reflective", "Excited", "Lonely"
     ])
+    date_range = st.date_input("Filter by date range:", value=())
     search_term = st.text_input("Search by keyword:")
 
-    found_entries = False
+    start_date, end_date = (date_range if len(date_range) == 2 else (None, None))
+    mood_filter = None if selected_mood == "All" else selected_mood
+
+    # 📄 Cursor stack: one entry per visited page, reset when filters change
+    filters = (mood_filter, start_date, end_date)
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
 
     with st.spinner("Loading your entries..."):
         try:
-            entries = db.collection("journals").order_by("created_at", direction=firestore.Query.DESCENDING).stream()
+            if search_term.strip():
+                # 🔎 Ranked results straight from the search index
+                entries, has_next = search(user_id, search_term, limit=SEARCH_LIMIT, fields=PREVIEW_FIELDS), False
+                if entries.truncated:
+                    st.caption("🔎 A search word matched too many terms to rank them all; type more of it for complete results.")
+            else:
+                entries, has_next = fetch_journal_page(user_id, mood_filter, start_date, end_date,
+                                                       cursor=cursors[-1], page_size=PAGE_SIZE)
 
+            rows = []
             for doc in entries:
                 data = doc.to_dict()
-                doc_id = doc.id
                 mood = data.get("mood", "unknown").lower()
-                entry_text = data.get("entry", "").lower()
+                timestamp = data.get("created_at")
+                created_on = timestamp.date() if timestamp else None
 
-                if selected_mood != "All" and mood != selected_mood.lower():
+                if mood_filter and mood != mood_filter.lower():
                     continue
-                if search_term and search_term.lower() not in entry_text:
+                if start_date and (not created_on or not start_date <= created_on <= end_date):
                     continue
+                rows.append((doc.id, mood, timestamp, data.get("preview") or "Open to read this entry."))
 
-                found_entries = True
-                emoji = MOOD_EMOJIS.get(mood, "📝")
-                timestamp = data.get("created_at")
-                feedback = data.get("feedback", "").lstrip("1234567890.:- ").strip()
-                entry = data.get("entry", "")
-
-                st.markdown(f"""
-                <div class="entry-card">
-                    <div class="entry-header">🧠 Mood: {emoji} {mood.capitalize()}</div>
-                    <div class="entry-text">🗣️ Feedback: {feedback}</div>
-                    <div class="entry-text">📝 Entry: {entry}</div>
-                    <div class="entry-caption">🕒 {timestamp.strftime('%d %b %Y, %I:%M %p') if timestamp else ''}</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-                if st.button(f"🗑️ Delete Entry", key=doc_id):
-                    db.collection("journals").document(doc_id).delete()
-                    st.success("Entry deleted. Please refresh to update view.")
-
-            if not found_entries:
+            if not rows:
                 st.info("📝 No journal entries found. Try adjusting your filters or start journaling!")
+            else:
+                # 🧾 The whole page of previews in one escaped block
+                st.markdown("".join(ROW_TEMPLATE.format(
+                    emoji=MOOD_EMOJIS.get(mood, "📝"),
+                    mood=escape(mood.capitalize()),
+                    preview=escape(preview),
+                    timestamp=timestamp.strftime('%d %b %Y, %I:%M %p') if timestamp else ""
+                ) for _, mood, timestamp, preview in rows), unsafe_allow_html=True)
+
+                # 📖 Full text and feedback load only for the opened entry
+                labels = {
+                    doc_id: f"{MOOD_EMOJIS.get(mood, '📝')} {timestamp.strftime('%d %b %Y, %I:%M %p') if timestamp else ''} · {preview[:40]}"
+                    for doc_id, mood, timestamp, preview in rows
+                }
+                opened = st.selectbox("Open an entry:", [None, *labels],
+                                      format_func=lambda doc_id: "—" if doc_id is None else labels[doc_id])
+                if opened:
+                    show_entry(opened)
+
+            # ⏮️ / ⏭️ Page navigation
+            if search_term.strip():
+                return
+            col_prev, col_page, col_next = st.columns([1, 1, 1])
+            with col_prev:
+                if st.button("⬅️ Newer", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with col_page:
+                st.markdown(f"<p style='text-align:center;'>Page {len(cursors)}</p>", unsafe_allow_html=True)
+            with col_next:
+                if st.button("Older ➡️", disabled=not has_next):
+                    cursors.append(entries[-1])
+                    st.rerun()
 
         except Exception as e:
             st.error("⚠️ Failed to load journal entries. Please check your Firebase setup.")
@@ -1,71 +1,20 @@
 import streamlit as st
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.firebase_config import db
-from firebase_admin import firestore
+from frontend.theme import inject_theme
+from backend.journal_repository import queue_reflection
+from backend import activity_index
 
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .glow-box {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-bottom: 20px;
-        }
-        .stMetric {
-            background-color: #111111;
-            border-radius: 10px;
-            padding: 10px;
-            box-shadow: 0 0 15px #FFD700;
-        }
-        @keyframes pulse {
-            0% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-            50% { transform: scale(1.1); box-shadow: 0 0 30px #FFD700; }
-            100% { transform: scale(1); box-shadow: 0 0 10px #FFD700; }
-        }
-        @media screen and (max-width: 768px) {
-            h1, h2, h3 {
-                font-size: 1.5rem;
-            }
-            .stButton>button {
-                padding: 8px 16px;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+# Temporary user ID for testing (replace with Firebase Auth later)
+user_id = "demo_user"
 
 def run_reflection():
     st.set_page_config(page_title="EchoSoul Reflection", layout="centered")
-    inject_bugatti_css()
+    inject_theme("reflection")
 
     st.markdown("""
         <div style='text-align: center; padding: 20px;'>
@@ -79,15 +28,10 @@ def run_reflection():
     mood = st.selectbox("How do you feel?", ["Happy", "Sad", "Anxious", "Calm", "Excited", "Reflective"])
     rating = st.slider("Rate your day", 1, 5)
 
-    # 💾 Save to Firestore
+    # 💾 Save locally, synced to Firestore in the background
     if st.button("Save Reflection"):
         if prompt.strip():
-            db.collection("reflections").add({
-                "text": prompt,
-                "mood": mood.lower(),
-                "rating": rating,
-                "created_at": datetime.now()
-            })
+            queue_reflection(user_id, prompt, mood, rating)
             st.success("Reflection saved!")
         else:
             st.warning("Please write something before saving.")
@@ -97,22 +41,10 @@ def run_reflection():
     st.markdown("<h3 style='color:#FFD700;'>🔥 Your Reflection Streak</h3>", unsafe_allow_html=True)
 
     try:
-        reflections = db.collection("reflections").order_by("created_at", direction=firestore.Query.DESCENDING).stream()
-
-        dates = []
-        for doc in reflections:
-            data = doc.to_dict()
-            created_at = data.get("created_at")
-            if created_at:
-                dates.append(created_at.date())
-
-        streak = 0
+        # 📅 One summary read from the activity index (journals + reflections)
         today = datetime.now().date()
-        for i in range(len(dates)):
-            if dates[i] == today - timedelta(days=streak):
-                streak += 1
-            else:
-                break
+        activity = activity_index.summary(user_id, today)
+        streak = activity["current_streak"]
 
         st.markdown(f"""
         <div style="text-align:center;">
@@ -122,5 +54,34 @@ def run_reflection():
         </div>
         """, unsafe_allow_html=True)
 
+        col1, col2 = st.columns(2)
+        col1.metric("🏆 Longest Streak", f"{activity['longest_streak']} days")
+        col2.metric("📆 Active This Month", f"{activity_index.days_active(user_id, today.replace(day=1), today)} days")
+
+        # 🗓️ Calendar heatmap straight from the year's bitmap
+        import plotly.graph_objects as go  # deferred: only needed for this chart
+        days = activity_index.calendar(user_id, today.year)
+        offset = days[0][0].weekday()
+        weeks = (len(days) + offset + 6) // 7
+        grid = [[None] * weeks for _ in range(7)]
+        labels = [[""] * weeks for _ in range(7)]
+        for i, (day, active) in enumerate(days):
+            week, weekday = divmod(i + offset, 7)
+            grid[weekday][week] = 1 if active else 0
+            labels[weekday][week] = day.strftime("%d %b")
+
+        fig = go.Figure(go.Heatmap(
+            z=grid, text=labels, hovertemplate="%{text}<extra></extra>",
+            colorscale=[[0, "#222222"], [1, "#FFD700"]], showscale=False, xgap=2, ygap=2
+        ))
+        fig.update_layout(
+            title=f"{today.year} Activity", height=220,
+            yaxis=dict(tickvals=list(range(7)), ticktext=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], autorange="reversed"),
+            xaxis=dict(showticklabels=False),
+            paper_bgcolor="black", plot_bgcolor="black", font=dict(color="white"),
+            margin=dict(l=40, r=10, t=40, b=10)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
     except Exception as e:
         st.error(f"Error loading streak: {e}")
\ No newline at end of file
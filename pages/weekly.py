@@ -4,58 +4,18 @@ import os
 from datetime import datetime, timedelta
 from collections import Counter
 import random
-import concurrent.futures
 
 # Add backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.firebase_config import db
-from backend.ai_services import generate_content
-from firebase_admin import firestore
+from frontend.theme import inject_theme
+from backend.ai_services import generate_content_stream, stream_with_fallback, emotion_story_prompt
+from backend.journal_repository import queue_story
+from frontend.job_view import start_job, show_job, clear_job
+from backend.content_pool import content_pool
+from backend.rollups import read_days, combine, mood_counts
 
-# 🔥 Inject Bugatti-grade CSS
-def inject_bugatti_css():
-    st.markdown("""
-    <style>
-        body {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', sans-serif;
-        }
-        h1, h2, h3 {
-            color: #FFD700;
-            text-shadow: 0 0 10px #FFD700;
-        }
-        .stButton>button {
-            background-color: #FFD700;
-            color: black;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: bold;
-            transition: 0.3s ease;
-        }
-        .stButton>button:hover {
-            background-color: #ffffff;
-            color: #000000;
-            box-shadow: 0 0 10px #FFD700;
-        }
-        .story-box {
-            background: linear-gradient(145deg, #111111, #222222);
-            border-radius: 12px;
-            padding: 20px;
-            box-shadow: 0 0 20px #FFD700;
-            margin-bottom: 20px;
-            font-style: italic;
-        }
-        @media screen and (max-width: 768px) {
-            h1, h2, h3 {
-                font-size: 1.5rem;
-            }
-            .stButton>button {
-                padding: 8px 16px;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+# Temporary user ID for testing (replace with Firebase Auth later)
+user_id = "demo_user"
 
 # Local stories for each emotion
 EMOTION_STORIES = {
@@ -91,20 +51,9 @@ EMOTION_STORIES = {
     ]
 }
 
-# Helper to save story to journal
-def save_story_to_journal(user_id, mood, story_text):
-    entry = {
-        "user_id": user_id,
-        "mood": mood,
-        "entry": story_text,
-        "source": "story",
-        "created_at": datetime.now()
-    }
-    db.collection("journals").add(entry)
-
 def run_weekly_summary():
     st.set_page_config(page_title="EchoSoul Weekly", layout="centered")
-    inject_bugatti_css()
+    inject_theme("weekly")
 
     st.markdown("""
         <div style='text-align: center; padding: 20px;'>
@@ -113,40 +62,24 @@ def run_weekly_summary():
         </div>
     """, unsafe_allow_html=True)
 
-    one_week_ago = datetime.now() - timedelta(days=7)
+    today = datetime.now().date()
 
     try:
-        journal_docs = db.collection("journals")\
-            .where("created_at", ">", one_week_ago)\
-            .select(["mood"])\
-            .order_by("created_at", direction=firestore.Query.DESCENDING)\
-            .limit(20).stream()
-
-        reflection_docs = db.collection("reflections")\
-            .where("created_at", ">", one_week_ago)\
-            .select(["mood", "rating"])\
-            .order_by("created_at", direction=firestore.Query.DESCENDING)\
-            .limit(20).stream()
-
-        journal_moods = [doc.to_dict().get("mood", "unknown") for doc in journal_docs]
-        reflection_data = [doc.to_dict() for doc in reflection_docs]
-        reflection_moods = [r.get("mood", "unknown") for r in reflection_data]
-        reflection_ratings = [r.get("rating", 0) for r in reflection_data if isinstance(r.get("rating", 0), (int, float))]
-
-        all_moods = journal_moods + reflection_moods
+        # 📊 Read the week's daily rollups instead of the raw entries
+        week = combine(read_days(user_id, today - timedelta(days=6), today).values())
+        all_moods = Counter(mood_counts(week))
 
         if not all_moods:
             st.info("No entries found for this week.")
             return
 
-        mood_counts = Counter(all_moods)
-        dominant_mood = mood_counts.most_common(1)[0][0]
-        avg_rating = round(sum(reflection_ratings) / len(reflection_ratings), 2) if reflection_ratings else "N/A"
+        dominant_mood = all_moods.most_common(1)[0][0]
+        avg_rating = round(week["rating_sum"] / week["rating_count"], 2) if week["rating_count"] else "N/A"
 
         st.markdown(f"<div class='story-box'>🧠 Dominant Mood: <b>{dominant_mood.capitalize()}</b></div>", unsafe_allow_html=True)
         st.markdown(f"<div class='story-box'>📊 Average Day Rating: <b>{avg_rating}</b></div>", unsafe_allow_html=True)
         st.markdown("<h3 style='color:#FFD700;'>🗂️ Mood Distribution:</h3>", unsafe_allow_html=True)
-        for mood, count in mood_counts.items():
+        for mood, count in all_moods.items():
             st.markdown(f"- {mood.capitalize()}: {count}")
 
         # 🎭 Emotion Story Section
@@ -157,26 +90,49 @@ def run_weekly_summary():
             with st.expander(f"📖 {mood.capitalize()} Story"):
                 col1, col2 = st.columns([1, 1])
 
+                # 🧰 Stories live in session_state, so the Save buttons survive the rerun
+                gemini_key, local_key = f"weekly_story_job_{mood}", f"weekly_local_story_{mood}"
+                pooled_key = f"weekly_pooled_story_{mood}"
                 with col1:
                     if st.button(f"✨ Gemini Story", key=f"{mood}_gemini"):
-                        try:
-                            with concurrent.futures.ThreadPoolExecutor() as executor:
-                                future = executor.submit(generate_content, f"Write a 5-line emotional story that captures the feeling of being {mood}.")
-                                story = future.result(timeout=4)
-                            st.markdown(f"<div class='story-box'>✨ {story}</div>", unsafe_allow_html=True)
-                            if st.button(f"💾 Save to Journal", key=f"{mood}_gemini_save"):
-                                save_story_to_journal("demo_user", mood, story)
-                                st.success("Story saved to journal!")
-                        except Exception:
-                            st.error("⚠️ Gemini failed to generate a story.")
+                        # 🫙 A pooled story is instant; an empty pool falls back to a live job
+                        pooled = content_pool.take("story", mood)
+                        if pooled:
+                            st.session_state[pooled_key] = pooled
+                            clear_job(gemini_key)
+                        else:
+                            st.session_state.pop(pooled_key, None)
+                            prompt = emotion_story_prompt(mood)
+                            # Falls back to a local story if Gemini fails or its circuit is open
+                            start_job(gemini_key, lambda prompt=prompt, mood=mood: stream_with_fallback(
+                                generate_content_stream(prompt), random.choice(EMOTION_STORIES[mood])
+                            ), key=("weekly_story", mood))
 
                 with col2:
                     if st.button(f"📚 Local Story", key=f"{mood}_local"):
-                        story = random.choice(EMOTION_STORIES[mood])
-                        st.markdown(f"<div class='story-box'>📚 {story}</div>", unsafe_allow_html=True)
-                        if st.button(f"💾 Save to Journal", key=f"{mood}_local_save"):
-                            save_story_to_journal("demo_user", mood, story)
-                            st.success("Story saved to journal!")
+                        st.session_state[local_key] = random.choice(EMOTION_STORIES[mood])
+
+                def show_gemini_story(story, done, mood=mood):
+                    if done and not story:
+                        st.error("⚠️ Gemini failed to generate a story.")
+                        return
+                    with st.container(border=True):
+                        st.markdown(story)
+                    if done and st.button(f"💾 Save to Journal", key=f"{mood}_gemini_save"):
+                        queue_story(user_id, mood, story)
+                        st.success("Story saved to journal!")
+
+                if pooled_key in st.session_state:
+                    show_gemini_story(st.session_state[pooled_key], True)
+                else:
+                    show_job(gemini_key, show_gemini_story, "⏳ Writing your story...")
+
+                story = st.session_state.get(local_key)
+                if story:
+                    st.markdown(f"<div class='story-box'>📚 {story}</div>", unsafe_allow_html=True)
+                    if st.button(f"💾 Save to Journal", key=f"{mood}_local_save"):
+                        queue_story(user_id, mood, story)
+                        st.success("Story saved to journal!")
 
     except Exception as e:
         st.error(f"Error loading weekly summary: {e}")
\ No newline at end of file
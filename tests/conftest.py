@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Add repo root so tests import backend / utils like the pages do
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 📁 Keep local state (queues, caches) out of the repo's .echosoul folder
+os.environ.setdefault("ECHOSOUL_DATA_DIR", tempfile.mkdtemp(prefix="echosoul-tests-"))
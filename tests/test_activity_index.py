@@ -0,0 +1,41 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+from backend import activity_index  # noqa: E402  (module import: it defines test_bit)
+
+
+def test_set_and_test_bit():
+    bits = activity_index.set_bit(None, 0)
+    bits = activity_index.set_bit(bits, 365)
+    assert len(bits) == activity_index.YEAR_BYTES
+    assert activity_index.test_bit(bits, 0) and activity_index.test_bit(bits, 365)
+    assert not activity_index.test_bit(bits, 1)
+    assert not activity_index.test_bit(None, 0)
+
+
+def test_count_bits_range():
+    bits = None
+    for index in (3, 4, 5, 40, 200):
+        bits = activity_index.set_bit(bits, index)
+    assert activity_index.count_bits(bits, 0, 365) == 5
+    assert activity_index.count_bits(bits, 4, 40) == 3
+    assert activity_index.count_bits(bits, 6, 39) == 0
+    assert activity_index.count_bits(bits, 10, 5) == 0
+
+
+def test_bit_index_is_day_of_year():
+    assert activity_index._bit_index(date(2024, 1, 1)) == 0
+    assert activity_index._bit_index(date(2024, 12, 31)) == 365
+
+
+@pytest.mark.parametrize("last_active, expected", [
+    ("2024-05-10", 4),   # active today
+    ("2024-05-09", 4),   # yesterday: still alive
+    ("2024-05-08", 0),   # lapsed
+    (None, 0),
+])
+def test_streak_from(last_active, expected):
+    data = {"current_streak": 4, "last_active": last_active} if last_active else {}
+    assert activity_index.streak_from(data, date(2024, 5, 10)) == expected
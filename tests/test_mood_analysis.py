@@ -0,0 +1,31 @@
+import pytest
+
+from utils.mood_analysis import analyze_text, classify_many
+
+TEXTS = [
+    "I am so happy today, everything went great!",
+    "I'm not happy at all, I feel really lonely tonight.",
+    "Feeling anxious and nervous about tomorrow's exam.",
+    "Grateful for my friends. Thank you, truly.",
+    "Just thinking back on the year and what it meant.",
+    "",
+    "Extremely angry about the traffic, so frustrated.",
+    "Not calm. Never calm when the deadline is this close.",
+    "Hopeful that things will get better soon 🌈",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_classify_many_matches_analyze_text(text):
+    single = analyze_text(text)
+    (batched,) = classify_many([text])
+    assert batched.mood == single.mood
+    assert batched.confidence == pytest.approx(single.confidence)
+    assert batched.distribution.keys() == single.distribution.keys()
+    for mood, share in single.distribution.items():
+        assert batched.distribution[mood] == pytest.approx(share)
+
+
+def test_classify_many_keeps_input_order():
+    results = classify_many(TEXTS)
+    assert [result.mood for result in results] == [analyze_text(text).mood for text in TEXTS]
@@ -0,0 +1,123 @@
+import pytest
+
+from backend import resilience
+from backend.executor import deadline
+from backend.resilience import CircuitBreaker, CircuitOpenError, classify, call
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class InvalidArgument(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff", lambda attempt: 0)
+
+
+@pytest.mark.parametrize("error, kind", [
+    (ResourceExhausted("429 quota exceeded"), resilience.QUOTA),
+    (TimeoutError(), resilience.TIMEOUT),
+    (ServiceUnavailable("503"), resilience.SERVER),
+    (InvalidArgument("bad prompt"), resilience.CLIENT),
+    (RuntimeError("boom"), resilience.UNKNOWN),
+])
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure(resilience.SERVER)
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure(resilience.SERVER)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.stats()["trips"] == 1
+
+
+def test_quota_opens_at_once():
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    breaker.record_failure(resilience.QUOTA)
+    assert breaker.state == "open"
+
+
+def test_client_errors_never_open():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    for _ in range(5):
+        breaker.record_failure(resilience.CLIENT)
+    assert breaker.state == "closed"
+    assert breaker.stats()["client_errors"] == 5
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure(resilience.SERVER)
+    assert breaker.state == "half_open"
+
+    assert breaker.allow()
+    assert not breaker.allow()  # probe in flight
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("test", failure_threshold=5, reset_timeout=0)
+    for _ in range(5):
+        breaker.record_failure(resilience.SERVER)
+    assert breaker.allow()
+    breaker.record_failure(resilience.SERVER)
+    assert breaker.stats()["trips"] == 2
+
+
+def test_call_retries_transient_errors_once_per_request():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    timeouts = []
+
+    def flaky(request_options):
+        timeouts.append(request_options["timeout"])
+        if len(timeouts) < 3:
+            raise ServiceUnavailable("503")
+        return "ok"
+
+    assert call(flaky, breaker=breaker, budget=5, retries=2) == "ok"
+    assert len(timeouts) == 3 and all(0 < timeout <= 5 for timeout in timeouts)
+    stats = breaker.stats()
+    assert stats["successes"] == 1 and stats["failures"] == 0
+
+
+def test_call_does_not_retry_client_errors():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    attempts = []
+
+    def rejected(request_options):
+        attempts.append(request_options)
+        raise InvalidArgument("bad prompt")
+
+    with pytest.raises(InvalidArgument):
+        call(rejected, breaker=breaker)
+    assert len(attempts) == 1
+    assert breaker.state == "closed"
+
+
+def test_call_fails_fast_while_open():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure(resilience.SERVER)
+    with pytest.raises(CircuitOpenError):
+        call(lambda request_options: "never", breaker=breaker)
+
+
+def test_executor_deadline_caps_attempt_timeout():
+    breaker = CircuitBreaker("test")
+    with deadline(0.5):
+        options = call(lambda request_options: request_options, breaker=breaker, budget=12)
+    assert options["timeout"] <= 0.5
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from utils.timeseries import ewma, lttb, rolling_mean
+
+
+def ewma_reference(values, alpha):
+    out = [values[0]]
+    for value in values[1:]:
+        out.append(alpha * value + (1 - alpha) * out[-1])
+    return np.array(out)
+
+
+@pytest.mark.parametrize("alpha", [0.05, 0.3, 0.9, 1.0])
+def test_ewma_matches_recurrence(alpha):
+    values = np.random.default_rng(7).normal(size=2000)
+    np.testing.assert_allclose(ewma(values, alpha), ewma_reference(values, alpha), rtol=1e-9, atol=1e-9)
+
+
+def test_ewma_small_alpha_stays_finite():
+    values = np.ones(5000)
+    result = ewma(values, 0.001)
+    assert np.isfinite(result).all()
+    np.testing.assert_allclose(result, 1.0)
+
+
+def test_ewma_rejects_bad_alpha():
+    with pytest.raises(ValueError):
+        ewma([1.0, 2.0], 0)
+
+
+def test_rolling_mean():
+    np.testing.assert_allclose(rolling_mean([1, 2, 3, 4], 2), [1, 1.5, 2.5, 3.5])
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    xs, ys = lttb(x, y, 20)
+    assert len(xs) == 20
+    assert xs[0] == 0 and xs[-1] == 999
+    assert 437 in xs
+    assert (np.diff(xs) > 0).all()
+
+
+def test_lttb_handles_dates():
+    days = np.arange("2024-01-01", "2025-01-01", dtype="datetime64[D]")
+    xs, ys = lttb(days, np.sin(np.arange(len(days))), 50)
+    assert xs.dtype == days.dtype and len(xs) == 50
+
+
+def test_lttb_returns_short_series_unchanged():
+    xs, ys = lttb([1, 2, 3], [4, 5, 6], 10)
+    assert list(xs) == [1, 2, 3] and list(ys) == [4, 5, 6]
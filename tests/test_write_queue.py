@@ -0,0 +1,159 @@
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from backend import write_queue as wq
+from backend.write_queue import WriteQueue, is_bad_payload
+
+# 🧪 Fake handler: records (user, text) and raises whatever FAILURES holds for a text
+CALLS = []
+FAILURES = {}
+
+
+def fake_save(user_id, text):
+    CALLS.append((user_id, text))
+    if text in FAILURES:
+        raise FAILURES[text]
+
+
+# Named like the SDK errors the queue matches on
+class InvalidArgument(Exception):
+    pass
+
+
+class PermissionDenied(Exception):
+    pass
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    CALLS.clear()
+    FAILURES.clear()
+    monkeypatch.setattr(WriteQueue, "start", lambda self: None)  # flush inline only
+    return WriteQueue(path=str(tmp_path / "queue.sqlite3"), handlers={"journal": (__name__, "fake_save")})
+
+
+def enqueue(queue, user_id, text):
+    return queue.enqueue("journal", {"user_id": user_id, "text": text})
+
+
+def make_due(queue):
+    queue._db().execute("UPDATE pending_writes SET next_attempt_at = 0")
+    queue._db().commit()
+
+
+def test_flushes_in_enqueue_order(queue):
+    for user_id, text in [("a", "a1"), ("b", "b1"), ("a", "a2")]:
+        enqueue(queue, user_id, text)
+
+    assert queue.flush_once() == 3
+    assert CALLS == [("a", "a1"), ("b", "b1"), ("a", "a2")]
+    assert queue.depth() == 0
+
+
+def test_retrying_row_blocks_only_its_user(queue):
+    FAILURES["a1"] = ValueError("Failed to commit transaction in 5 attempts.")
+    for user_id, text in [("a", "a1"), ("a", "a2"), ("b", "b1")]:
+        enqueue(queue, user_id, text)
+
+    assert queue.flush_once() == 1
+    assert CALLS == [("a", "a1"), ("b", "b1")]
+
+    # a1 is backing off, so a2 must keep waiting behind it
+    CALLS.clear()
+    assert queue.flush_once() == 0
+    assert CALLS == []
+    assert queue.stats()["dead_letters"] == 0
+
+    del FAILURES["a1"]
+    make_due(queue)
+    assert queue.flush_once() == 2
+    assert CALLS == [("a", "a1"), ("a", "a2")]
+
+
+def test_bad_payload_is_dead_lettered_at_once(queue):
+    FAILURES["a1"] = InvalidArgument("Document field value is invalid")
+    enqueue(queue, "a", "a1")
+    enqueue(queue, "a", "a2")
+
+    assert queue.flush_once() == 1
+    assert CALLS == [("a", "a1"), ("a", "a2")]
+    stats = queue.stats()
+    assert stats["depth"] == 0 and stats["dead_letters"] == 1
+
+
+def test_transient_errors_dead_letter_after_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(wq, "MAX_ATTEMPTS", 2)
+    FAILURES["a1"] = ServiceUnavailable("503 backend unavailable")
+    enqueue(queue, "a", "a1")
+
+    queue.flush_once()
+    assert queue.stats()["dead_letters"] == 0
+    make_due(queue)
+    queue.flush_once()
+    assert queue.stats()["dead_letters"] == 1
+    assert queue.depth() == 0
+
+
+def test_requeue_dead_keeps_order(queue):
+    FAILURES["a1"] = InvalidArgument("bad")
+    first = enqueue(queue, "a", "a1")
+    queue.flush_once()
+    del FAILURES["a1"]
+
+    enqueue(queue, "a", "a2")
+    make_due(queue)
+    CALLS.clear()
+    assert queue.requeue_dead() == 1
+    assert queue._db().execute("SELECT MIN(seq) FROM pending_writes").fetchone()[0] == first
+
+    assert queue.flush_once() == 2
+    assert CALLS == [("a", "a1"), ("a", "a2")]
+    assert queue.stats()["dead_letters"] == 0
+
+
+def test_unknown_kind_is_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.enqueue("story", {"user_id": "a"})
+
+
+class _Entry(BaseModel):
+    mood: str
+
+
+def _validation_error():
+    try:
+        _Entry(mood=None)
+    except ValidationError as e:
+        return e
+
+
+@pytest.mark.parametrize("error", [
+    TypeError("save_journal_entry() got an unexpected keyword argument 'tone'"),
+    json.JSONDecodeError("Expecting value", "{", 1),
+    InvalidArgument("Property entry contains an invalid nested entity"),
+    _validation_error(),
+    Exception("Document exceeds the maximum allowed size of 1,048,576 bytes"),
+])
+def test_bad_payload_errors(error):
+    assert is_bad_payload(error)
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("Failed to commit transaction in 5 attempts."),
+    PermissionDenied("Missing or insufficient permissions."),
+    NotFound("The database (default) does not exist"),
+    ServiceUnavailable("503 The service is currently unavailable."),
+    TimeoutError("Deadline exceeded"),
+])
+def test_transient_errors_retry(error):
+    assert not is_bad_payload(error)
@@ -0,0 +1,260 @@
+import re
+import math
+import os
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+
+# 📚 Weighted mood lexicon: phrase -> {mood: weight}
+# Phrases are matched as whole words, case-insensitively, in one regex pass.
+MOOD_LEXICON = {
+    # happy
+    "happy": {"happy": 1.0}, "happier": {"happy": 1.0}, "happiest": {"happy": 1.2},
+    "joy": {"happy": 1.0}, "joyful": {"happy": 1.0}, "glad": {"happy": 0.8},
+    "cheerful": {"happy": 0.9}, "great": {"happy": 0.5}, "good": {"happy": 0.4},
+    "amazing": {"happy": 0.7, "excited": 0.3}, "wonderful": {"happy": 0.8},
+    "smile": {"happy": 0.5}, "smiled": {"happy": 0.5}, "laughed": {"happy": 0.6},
+    "fun": {"happy": 0.6}, "love": {"happy": 0.5, "grateful": 0.2}, "loved": {"happy": 0.5},
+    # sad
+    "sad": {"sad": 1.0}, "sadness": {"sad": 1.0}, "unhappy": {"sad": 1.0},
+    "down": {"sad": 0.5}, "depressed": {"sad": 1.2}, "cry": {"sad": 0.9}, "cried": {"sad": 0.9},
+    "crying": {"sad": 0.9}, "tears": {"sad": 0.7}, "heartbroken": {"sad": 1.2},
+    "miserable": {"sad": 1.1}, "hopeless": {"sad": 1.0}, "grief": {"sad": 1.0},
+    "hurt": {"sad": 0.7}, "lost": {"sad": 0.4}, "empty": {"sad": 0.6, "lonely": 0.3},
+    # lonely
+    "lonely": {"lonely": 1.0, "sad": 0.3}, "alone": {"lonely": 0.8}, "isolated": {"lonely": 1.0},
+    "left out": {"lonely": 0.9}, "nobody": {"lonely": 0.5}, "miss": {"lonely": 0.5, "sad": 0.2},
+    "missing": {"lonely": 0.4},
+    # anxious
+    "anxious": {"anxious": 1.0}, "anxiety": {"anxious": 1.0}, "overwhelmed": {"anxious": 1.0},
+    "worried": {"anxious": 1.0}, "worry": {"anxious": 0.9}, "worrying": {"anxious": 0.9},
+    "nervous": {"anxious": 0.9}, "stressed": {"anxious": 1.0}, "stress": {"anxious": 0.8},
+    "panic": {"anxious": 1.2}, "scared": {"anxious": 0.9}, "afraid": {"anxious": 0.9},
+    "tense": {"anxious": 0.7}, "restless": {"anxious": 0.6}, "on edge": {"anxious": 0.9},
+    "deadline": {"anxious": 0.4},
+    # calm
+    "calm": {"calm": 1.0}, "peaceful": {"calm": 1.0}, "peace": {"calm": 0.8},
+    "relaxed": {"calm": 1.0}, "relaxing": {"calm": 0.8}, "serene": {"calm": 1.0},
+    "content": {"calm": 0.7, "happy": 0.2}, "rested": {"calm": 0.7}, "at ease": {"calm": 0.9},
+    "quiet": {"calm": 0.4}, "meditated": {"calm": 0.7},
+    # angry
+    "angry": {"angry": 1.0}, "anger": {"angry": 1.0}, "mad": {"angry": 0.9},
+    "frustrated": {"angry": 1.0}, "frustrating": {"angry": 0.8}, "furious": {"angry": 1.3},
+    "annoyed": {"angry": 0.7}, "irritated": {"angry": 0.8}, "hate": {"angry": 0.9},
+    "fed up": {"angry": 0.9}, "unfair": {"angry": 0.6},
+    # grateful
+    "grateful": {"grateful": 1.0}, "thankful": {"grateful": 1.0}, "thanks": {"grateful": 0.6},
+    "blessed": {"grateful": 0.9}, "appreciate": {"grateful": 0.8}, "appreciated": {"grateful": 0.8},
+    "gratitude": {"grateful": 1.0},
+    # hopeful
+    "hopeful": {"hopeful": 1.0}, "optimistic": {"hopeful": 1.0}, "hope": {"hopeful": 0.8},
+    "looking forward": {"hopeful": 0.8, "excited": 0.3}, "better tomorrow": {"hopeful": 0.9},
+    "motivated": {"hopeful": 0.7, "excited": 0.3}, "confident": {"hopeful": 0.6},
+    # excited
+    "excited": {"excited": 1.0}, "exciting": {"excited": 0.9}, "thrilled": {"excited": 1.1},
+    "can't wait": {"excited": 1.0}, "cannot wait": {"excited": 1.0}, "pumped": {"excited": 0.9},
+    "eager": {"excited": 0.7}, "celebrate": {"excited": 0.6, "happy": 0.3},
+    # reflective
+    "reflective": {"reflective": 1.0}, "thinking": {"reflective": 0.6}, "thought": {"reflective": 0.4},
+    "wondering": {"reflective": 0.6}, "realized": {"reflective": 0.8}, "reflect": {"reflective": 0.9},
+    "reflecting": {"reflective": 0.9}, "learned": {"reflective": 0.6}, "remember": {"reflective": 0.4},
+    "nostalgic": {"reflective": 0.9, "sad": 0.2},
+}
+
+NEGATORS = {"not", "no", "never", "isn't", "wasn't", "aren't", "don't", "didn't", "doesn't",
+            "can't", "cannot", "hardly", "barely", "without", "nor", "nothing"}
+INTENSIFIERS = {"very": 1.5, "really": 1.4, "so": 1.4, "extremely": 1.8, "super": 1.5,
+                "incredibly": 1.7, "totally": 1.4, "deeply": 1.6, "too": 1.3, "quite": 1.2,
+                "a bit": 0.6, "slightly": 0.5, "somewhat": 0.7, "kind of": 0.7, "kinda": 0.7}
+
+# A negated mood counts partly towards its opposite ("not happy" leans sad)
+NEGATION_FLIP = {"happy": "sad", "calm": "anxious", "hopeful": "sad", "excited": "reflective",
+                 "sad": "calm", "anxious": "calm", "angry": "calm", "lonely": "calm"}
+NEGATION_FLIP_WEIGHT = 0.5
+
+NEGATION_SCOPE = 3  # words after a negator that it still applies to
+AMBIGUOUS_BELOW = 0.45  # confidence under this should be checked by Gemini
+
+MOODS = ["happy", "sad", "anxious", "calm", "angry", "grateful", "hopeful", "reflective", "excited", "lonely"]
+
+# 📈 Valence used for "mood score over time" charts and rollups
+MOOD_SCORES = {
+    "happy": 5, "excited": 4, "grateful": 3, "hopeful": 2,
+    "calm": 1, "reflective": 0, "unclear": 0,
+    "anxious": -1, "sad": -2, "lonely": -3, "angry": -4, "error": 0
+}
+
+MOOD_FEEDBACK = {
+    "sad": "You seem down—take a moment to breathe.",
+    "happy": "Glad you're feeling good!",
+    "anxious": "Try grounding yourself—you're doing great.",
+    "calm": "Enjoy the serenity.",
+    "angry": "Let it out—your feelings are valid.",
+    "grateful": "Gratitude is powerful—keep it flowing.",
+    "hopeful": "Hope is a strength—hold onto it.",
+    "reflective": "Reflection brings clarity—keep exploring.",
+    "excited": "Ride that energy—something good is coming.",
+    "lonely": "Reach out to someone today—you matter.",
+    "unclear": "Couldn't detect mood clearly.",
+}
+
+
+def _alternation(phrases):
+    # Longest first so "looking forward" wins over shorter overlaps
+    ordered = sorted(phrases, key=len, reverse=True)
+    return "|".join(re.escape(p).replace(r"\ ", r"\s+") for p in ordered)
+
+
+# ⚡ One compiled pattern covers lexicon, negators, intensifiers and clause breaks
+_TOKEN_RE = re.compile(
+    rf"(?P<break>[.!?;\n]|\bbut\b)"
+    rf"|\b(?P<mood>{_alternation(MOOD_LEXICON)})\b"
+    rf"|\b(?P<neg>{_alternation(NEGATORS)})\b"
+    rf"|\b(?P<int>{_alternation(INTENSIFIERS)})\b",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"\w+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+class MoodResult(NamedTuple):
+    mood: str
+    feedback: str
+    confidence: float
+    distribution: dict
+
+    @property
+    def ambiguous(self):
+        return self.confidence < AMBIGUOUS_BELOW
+
+
+def _key(phrase):
+    return _SPACES_RE.sub(" ", phrase.lower())
+
+
+# 🔎 Lexicon hits for one text as (phrase, multiplier, negated), single regex pass
+def iter_hits(text):
+    negate_until = -1
+    boost = 1.0
+    word_index = 0
+    last_end = 0
+
+    for match in _TOKEN_RE.finditer(text):
+        word_index += len(_WORD_RE.findall(text, last_end, match.start()))
+        last_end = match.end()
+        kind = match.lastgroup
+
+        if kind == "break":
+            negate_until, boost = -1, 1.0
+            continue
+
+        word_index += 1
+        token = _key(match.group(kind))
+        if kind == "neg":
+            negate_until = word_index + NEGATION_SCOPE
+        elif kind == "int":
+            boost *= INTENSIFIERS[token]
+        else:
+            yield token, boost, word_index <= negate_until
+            boost = 1.0
+
+
+def score_text(text):
+    scores = dict.fromkeys(MOODS, 0.0)
+    for token, boost, negated in iter_hits(text):
+        for mood, weight in MOOD_LEXICON[token].items():
+            if not negated:
+                scores[mood] += weight * boost
+            elif mood in NEGATION_FLIP:
+                scores[NEGATION_FLIP[mood]] += weight * boost * NEGATION_FLIP_WEIGHT
+    return scores
+
+
+def _result_from_scores(scores):
+    total = sum(scores.values())
+    if total <= 0:
+        return MoodResult("unclear", MOOD_FEEDBACK["unclear"], 0.0, {})
+
+    distribution = {mood: round(score / total, 3) for mood, score in scores.items() if score > 0}
+    mood = max(distribution, key=distribution.get)
+    # Share of the winning mood, discounted when there is little evidence overall
+    confidence = round(distribution[mood] * (1 - math.exp(-total)), 3)
+    return MoodResult(mood, MOOD_FEEDBACK[mood], confidence, distribution)
+
+
+# 🧠 Local mood engine: multi-label distribution plus a confidence score
+def analyze_text(text):
+    return _result_from_scores(score_text(text or ""))
+
+
+# 📦 Batch API ------------------------------------------------------------
+
+PARALLEL_THRESHOLD = 5000  # below this, process start-up costs more than it saves
+_TERMS = list(MOOD_LEXICON)
+_TERM_INDEX = {term: i for i, term in enumerate(_TERMS)}
+_MATRICES = None
+
+
+def _lexicon_matrices():
+    # term x mood weights for plain hits and for negated hits
+    global _MATRICES
+    if _MATRICES is None:
+        import numpy as np
+        direct = np.zeros((len(_TERMS), len(MOODS)))
+        flipped = np.zeros_like(direct)
+        mood_index = {mood: j for j, mood in enumerate(MOODS)}
+        for i, term in enumerate(_TERMS):
+            for mood, weight in MOOD_LEXICON[term].items():
+                direct[i, mood_index[mood]] += weight
+                if mood in NEGATION_FLIP:
+                    flipped[i, mood_index[NEGATION_FLIP[mood]]] += weight * NEGATION_FLIP_WEIGHT
+        _MATRICES = (direct, flipped)
+    return _MATRICES
+
+
+def _classify_chunk(texts):
+    import numpy as np
+    direct, flipped = _lexicon_matrices()
+
+    rows, cols, weights, negated = [], [], [], []
+    for row, text in enumerate(texts):
+        for token, boost, is_negated in iter_hits(text or ""):
+            rows.append(row)
+            cols.append(_TERM_INDEX[token])
+            weights.append(boost)
+            negated.append(is_negated)
+
+    plain = np.zeros((len(texts), len(_TERMS)))
+    negs = np.zeros_like(plain)
+    if rows:
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        weights, negated = np.asarray(weights), np.asarray(negated)
+        np.add.at(plain, (rows[~negated], cols[~negated]), weights[~negated])
+        np.add.at(negs, (rows[negated], cols[negated]), weights[negated])
+
+    scores = plain @ direct + negs @ flipped
+    totals = scores.sum(axis=1)
+    safe_totals = np.where(totals > 0, totals, 1.0)
+    shares = np.round(scores / safe_totals[:, None], 3)
+    winners = shares.argmax(axis=1)
+    confidences = np.round(shares[np.arange(len(texts)), winners] * (1 - np.exp(-totals)), 3)
+
+    results = []
+    for i in range(len(texts)):
+        if totals[i] <= 0:
+            results.append(MoodResult("unclear", MOOD_FEEDBACK["unclear"], 0.0, {}))
+            continue
+        mood = MOODS[winners[i]]
+        distribution = {MOODS[j]: float(shares[i, j]) for j in np.flatnonzero(scores[i] > 0)}
+        results.append(MoodResult(mood, MOOD_FEEDBACK[mood], float(confidences[i]), distribution))
+    return results
+
+
+# 🚀 Classify many entries at once; large inputs are sharded across processes
+def classify_many(texts, workers=None, chunk_size=2000):
+    texts = list(texts)
+    if len(texts) < PARALLEL_THRESHOLD:
+        return _classify_chunk(texts)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return [result for chunk in pool.map(_classify_chunk, chunks) for result in chunk]
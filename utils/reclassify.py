@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# Add backend path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.local_store import data_path
+from utils.mood_analysis import MOODS, classify_many
+
+# 🔁 Reclassify historical journal moods with the local engine
+#   python -m utils.reclassify                 # only unknown / error / free-form labels
+#   python -m utils.reclassify --all --dry-run # score everything, write nothing
+
+KNOWN_MOODS = set(MOODS) | {"unclear"}
+MAX_BATCH_WRITES = 500  # Firestore batch limit
+
+
+def needs_reclassify(data, include_all=False):
+    if not data.get("entry"):
+        return False
+    if include_all:
+        return True
+    return str(data.get("mood", "unknown")).lower() not in KNOWN_MOODS
+
+
+def load_checkpoint(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"last_id": None, "scanned": 0, "updated": 0}
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)  # atomic, so a crash never leaves a half-written checkpoint
+
+
+def stream_chunks(db, collection, chunk_size, last_id=None):
+    from google.cloud.firestore_v1.field_path import FieldPath
+
+    ref = db.collection(collection)
+    while True:
+        query = ref.order_by(FieldPath.document_id()).select(["entry", "mood", "user_id", "created_at"]).limit(chunk_size)
+        if last_id:
+            query = query.where(FieldPath.document_id(), ">", ref.document(last_id))
+        docs = list(query.stream())
+        if not docs:
+            return
+        yield docs
+        last_id = docs[-1].id
+
+
+# ✍️ Through the repository, so day / week rollups follow the new mood
+def write_results(db, collection, updates):
+    from firebase_admin import firestore
+    from backend.journal_repository import update_journal_mood, MOOD_UPDATE_WRITES, JOURNALS, journals_tag, entry_tag
+    from backend.search_index import search_tag
+    from backend.rollups import rollup_tag
+    from backend.query_cache import invalidate
+
+    per_batch = MAX_BATCH_WRITES // MOOD_UPDATE_WRITES
+    owners = set()
+    for start in range(0, len(updates), per_batch):
+        batch = db.batch()
+        for doc_id, data, result in updates[start:start + per_batch]:
+            owners.add(update_journal_mood(batch, doc_id, data, result.mood, {
+                "mood_confidence": result.confidence,
+                "mood_distribution": result.distribution,
+                "engine": "🧠 Fallback",
+                "reclassified_at": firestore.SERVER_TIMESTAMP
+            }, collection=collection))
+        batch.commit()
+    # Only the owners touched lose their cached pages, search results and rollups
+    tags = [rollup_tag(owner) for owner in owners]
+    if collection == JOURNALS:
+        tags += [journals_tag(owner) for owner in owners] + [search_tag(owner) for owner in owners]
+        tags += [entry_tag(doc_id) for doc_id, _, _ in updates]
+    invalidate(*tags)
+
+
+def run(args):
+    from backend.firebase_config import get_db
+
+    db = get_db()
+
+    checkpoint = {"last_id": None, "scanned": 0, "updated": 0} if args.restart else load_checkpoint(args.checkpoint)
+    started = time.perf_counter()
+    scanned_before, updated_before = checkpoint["scanned"], checkpoint["updated"]
+
+    for docs in stream_chunks(db, args.collection, args.chunk_size, checkpoint["last_id"]):
+        targets = [(doc.id, doc.to_dict()) for doc in docs]
+        targets = [(doc_id, data) for doc_id, data in targets if needs_reclassify(data, args.all)]
+
+        results = classify_many([data["entry"] for _, data in targets], workers=args.workers)
+        updates = [
+            (doc_id, data, result) for (doc_id, data), result in zip(targets, results)
+            if result.mood != "unclear" and result.confidence >= args.min_confidence
+        ]
+        if updates and not args.dry_run:
+            write_results(db, args.collection, updates)
+
+        checkpoint["last_id"] = docs[-1].id
+        checkpoint["scanned"] += len(docs)
+        checkpoint["updated"] += len(updates)
+        if not args.dry_run:
+            save_checkpoint(args.checkpoint, checkpoint)
+
+        elapsed = time.perf_counter() - started
+        rate = (checkpoint["scanned"] - scanned_before) / elapsed if elapsed else 0.0
+        print(f"scanned={checkpoint['scanned']} updated={checkpoint['updated']} rate={rate:.0f} entries/sec")
+
+    elapsed = time.perf_counter() - started
+    scanned = checkpoint["scanned"] - scanned_before
+    print(f"✅ Done: {scanned} scanned, {checkpoint['updated'] - updated_before} updated "
+          f"in {elapsed:.1f}s ({scanned / elapsed if elapsed else 0.0:.0f} entries/sec)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reclassify journal moods with the local mood engine.")
+    parser.add_argument("--collection", default="journals")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="documents read per query page")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size for large chunks")
+    parser.add_argument("--min-confidence", type=float, default=0.0, help="skip results below this confidence")
+    parser.add_argument("--all", action="store_true", help="reclassify every entry, not just unknown labels")
+    parser.add_argument("--dry-run", action="store_true", help="classify and report without writing")
+    parser.add_argument("--checkpoint", default=data_path("reclassify_checkpoint.json"))
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
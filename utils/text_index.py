@@ -0,0 +1,63 @@
+import re
+import unicodedata
+from collections import Counter
+
+# 🔤 Tokenizing + light stemming shared by the search index and its queries
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "had", "has", "have",
+    "he", "her", "him", "his", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our",
+    "she", "so", "that", "the", "their", "them", "then", "there", "they", "this", "to", "was",
+    "we", "were", "what", "when", "which", "who", "will", "with", "you", "your",
+}
+
+# Longest suffixes first; a stem keeps at least MIN_STEM characters
+SUFFIXES = ("fulness", "ations", "ation", "ingly", "edly", "ness", "ment", "ings", "ing",
+            "ies", "ied", "ful", "ly", "ed", "es", "s")
+REPLACEMENTS = {"ies": "i", "ied": "i"}
+MIN_STEM = 3
+MAX_SUFFIX = max(len(suffix) for suffix in SUFFIXES)
+
+# Letters and digits in any script, plus combining marks (Devanagari vowel
+# signs etc. are not \w) and apostrophes; "_" is excluded since index
+# document IDs use it as the bucket separator
+_MARKS = "".join(chr(c) for c in range(0x10000) if unicodedata.category(chr(c)).startswith("M"))
+_WORD_RE = re.compile(rf"(?:[^\W_]|[{re.escape(_MARKS)}'])+", re.UNICODE)
+
+
+def stem(word):
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            word = word[:-len(suffix)] + REPLACEMENTS.get(suffix, "")
+            break
+    # happy / happiness / happier -> happi
+    if word.endswith("y") and len(word) > MIN_STEM:
+        word = word[:-1] + "i"
+    return word
+
+
+def _clean(word):
+    word = word.strip("'")
+    return word[:-2] if word.endswith("'s") else word
+
+
+def words(text):
+    cleaned = (_clean(w) for w in _WORD_RE.findall((text or "").lower().replace("’", "'")))
+    return [w for w in cleaned if w and w not in STOPWORDS]
+
+
+def tokenize(text):
+    return [stem(w) for w in words(text)]
+
+
+# 🔡 A partially typed word can run past its stem ("happin" for happiness ->
+# happi), so its stem is no prefix of the indexed term. Instead, any index
+# term that is a prefix of the typed word, at most MAX_SUFFIX shorter, may match.
+def partial_stems(word):
+    shortest = max(MIN_STEM, len(word) - MAX_SUFFIX)
+    return [word[:n] for n in range(len(word), shortest - 1, -1)]
+
+
+# Most frequent first, so callers can split off the rarest terms
+def term_frequencies(text, max_terms=None):
+    return dict(Counter(tokenize(text)).most_common(max_terms))
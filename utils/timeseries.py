@@ -0,0 +1,102 @@
+import numpy as np
+
+# 📈 Time-series helpers over datetime64[D] arrays.
+# Everything is vectorized with NumPy so a multi-year daily series costs
+# about the same as a week: resample to day / week / month buckets,
+# smooth with rolling or exponentially weighted means, and downsample
+# to a fixed point budget with LTTB before plotting.
+
+FREQUENCIES = ("day", "week", "month")
+EWMA_CHUNK = 256
+
+
+def as_days(dates):
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+def bucket_starts(dates, freq="day"):
+    days = as_days(dates)
+    if freq == "day":
+        return days
+    if freq == "week":
+        # 1970-01-01 was a Thursday: +3 makes Monday weekday 0
+        weekday = (days.astype("int64") + 3) % 7
+        return days - weekday.astype("timedelta64[D]")
+    if freq == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Unknown frequency: {freq}")
+
+
+# 🪣 Sum values per bucket: returns (sorted bucket starts, sums)
+def resample_sum(dates, values, freq="day"):
+    buckets, inverse = np.unique(bucket_starts(dates, freq), return_inverse=True)
+    return buckets, np.bincount(inverse, weights=np.asarray(values, dtype=float), minlength=len(buckets))
+
+
+# ⚖️ Weighted mean per bucket from per-point sums and counts (e.g. rollups)
+def resample_mean(dates, sums, counts, freq="day"):
+    buckets, totals = resample_sum(dates, sums, freq)
+    _, weights = resample_sum(dates, counts, freq)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / weights
+    keep = weights > 0
+    return buckets[keep], means[keep]
+
+
+# 🔁 Trailing mean over the last `window` points (shorter at the start)
+def rolling_mean(values, window):
+    values = np.asarray(values, dtype=float)
+    if window <= 1 or len(values) == 0:
+        return values.copy()
+    sums = np.cumsum(np.insert(values, 0, 0.0))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+# 🌊 y[t] = alpha * x[t] + (1 - alpha) * y[t-1], y[0] = x[0].
+# Each chunk is solved in closed form with cumulative sums; chunks stay
+# short enough that decay**-k cannot overflow.
+def ewma(values, alpha, chunk_size=EWMA_CHUNK):
+    values = np.asarray(values, dtype=float)
+    if not 0 < alpha <= 1:
+        raise ValueError("alpha must be in (0, 1]")
+    decay = 1.0 - alpha
+    if len(values) == 0 or decay == 0.0:
+        return values.copy()
+
+    chunk_size = max(1, min(chunk_size, int(200 / -np.log10(decay)))) if decay < 1 else chunk_size
+    out = np.empty_like(values)
+    previous = values[0]
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = powers * (previous + np.cumsum(alpha * chunk / powers))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+# 🎯 Largest-Triangle-Three-Buckets: keeps the visual shape in `threshold` points
+def lttb(x, y, threshold):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    xs = x.astype("datetime64[D]").astype(float) if np.issubdtype(x.dtype, np.datetime64) else x.astype(float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        ax, ay = xs[selected], y[selected]
+        areas = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - xs[start:end]) * (avg_y - ay))
+        selected = start + int(np.argmax(areas))
+        keep[i + 1] = selected
+    return x[keep], y[keep]